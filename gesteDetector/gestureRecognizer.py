@@ -1,9 +1,10 @@
 from __future__ import annotations
 from pathlib import Path
-import urllib.request
 import cv2
 import numpy as np
 
+from src.modelStore import STORE, LazyModel, ModelAsset
+
 
 # mapping des points MediaPipe pour chaque doigt
 # format: (mcp, pip, dip, tip)
@@ -139,39 +140,116 @@ def detect_gesture(kpts2d):
     return ""
 
 
-# dossier pour stocker les modèles
-BASE_DIR = Path(__file__).resolve().parent
-ASSETS_DIR = BASE_DIR / "hand_assets"
-ASSETS_DIR.mkdir(parents=True, exist_ok=True)
+# =========================
+# VERSION VECTORISÉE (N mains)
+# =========================
+
+FINGER_NAMES = ("Thumb", "Index", "Middle", "Ring", "Pinky")
+
+# points (a, b, c) de l'angle ABC mesuré pour chaque doigt (même choix que finger_states)
+_ANGLE_POINTS = np.array([
+    (1, 2, 3),
+    (5, 6, 7),
+    (9, 10, 11),
+    (13, 14, 15),
+    (17, 18, 19),
+])
+# seuil (degrés) au-delà duquel le doigt est considéré tendu
+_ANGLE_THRESHOLDS = np.array([155.0, 165.0, 165.0, 165.0, 165.0], dtype=np.float32)
+
+GESTURE_LABELS = np.array(["ok", "main ouverte", "deux doigts", "pouce en l air", "poing ferme", ""])
+
+
+def joint_angles_batch(kpts):
+    """
+    angles ABC (degrés) des 5 doigts pour N mains
+
+    kpts : tableau (N, 21, 2)
+    retour : tableau (N, 5) dans l'ordre de FINGER_NAMES
+    """
+    kpts = np.asarray(kpts, dtype=np.float32)
+    a = kpts[:, _ANGLE_POINTS[:, 0]]
+    b = kpts[:, _ANGLE_POINTS[:, 1]]
+    c = kpts[:, _ANGLE_POINTS[:, 2]]
+
+    ba = a - b
+    bc = c - b
+    nba = np.linalg.norm(ba, axis=-1)
+    nbc = np.linalg.norm(bc, axis=-1)
+
+    degenerate = (nba < 1e-6) | (nbc < 1e-6)
+    denom = np.where(degenerate, 1.0, nba * nbc)
+    cosang = np.clip(np.einsum("nfk,nfk->nf", ba, bc) / denom, -1.0, 1.0)
+    angles = np.degrees(np.arccos(cosang))
+    return np.where(degenerate, 180.0, angles)
+
+
+def finger_states_batch(kpts):
+    """
+    état des doigts pour N mains
 
-PALM_ONNX_URL = "https://huggingface.co/opencv/palm_detection_mediapipe/resolve/main/palm_detection_mediapipe_2023feb.onnx"
-HAND_ONNX_URL = "https://huggingface.co/opencv/handpose_estimation_mediapipe/resolve/main/handpose_estimation_mediapipe_2023feb.onnx"
+    retour : tableau booléen (N, 5), True = doigt tendu
+    """
+    return joint_angles_batch(kpts) > _ANGLE_THRESHOLDS
 
-MP_PALMDET_URL = "https://huggingface.co/spaces/opencv/handpose_estimation_mediapipe/raw/main/mp_palmdet.py"
-MP_HANDPOSE_URL = "https://huggingface.co/spaces/opencv/handpose_estimation_mediapipe/raw/main/mp_handpose.py"
 
+def detect_gesture_batch(kpts):
+    """
+    même règles que detect_gesture, appliquées à N mains à la fois
+    (plusieurs mains ou toute une séquence enregistrée)
+
+    kpts : tableau (N, 21, 2)
+    retour : tableau (N,) de libellés ("" si aucun geste)
+    """
+    kpts = np.asarray(kpts, dtype=np.float32)
+    if kpts.ndim == 2:
+        kpts = kpts[np.newaxis]
+
+    ext = finger_states_batch(kpts)
+    thumb_ext, idx, mid, ring, pinky = ext.T
+
+    wrist = kpts[:, 0]
+    index_mcp = kpts[:, 5]
+    thumb_tip = kpts[:, 4]
+    index_tip = kpts[:, 8]
+
+    palm_size = np.linalg.norm(index_mcp - wrist, axis=-1)
+    palm_size = np.where(palm_size < 1e-6, 1.0, palm_size)
+
+    d_thumb = np.linalg.norm(thumb_tip - index_mcp, axis=-1) / palm_size
+    d_ti = np.linalg.norm(thumb_tip - index_tip, axis=-1) / palm_size
+
+    THUMB_STICKY = 0.55
+    thumb_is_stuck = d_thumb < THUMB_STICKY
+    thumb_is_detached = d_thumb > (THUMB_STICKY + 0.10)
 
-def _download_if_missing(url: str, dst: Path):
-    if dst.exists() and dst.stat().st_size > 0:
-        return
-    print("download:", dst.name)
-    tmp = dst.with_suffix(".tmp")
-    urllib.request.urlretrieve(url, tmp)
-    tmp.replace(dst)
+    all_folded = ~idx & ~mid & ~ring & ~pinky
+    thumbs_up = all_folded & ~thumb_is_stuck & thumb_is_detached & thumb_ext
 
+    conditions = [
+        (d_ti < 0.35) & mid & ring & pinky,
+        idx & mid & ring & pinky & thumb_is_detached,
+        idx & mid & ~ring & ~pinky,
+        thumbs_up,
+        all_folded,
+    ]
+    # np.select garde la première condition vraie, comme l'enchaînement des if
+    choice = np.select(conditions, np.arange(len(conditions)), default=len(conditions))
+    return GESTURE_LABELS[choice]
 
-def _ensure_assets():
-    palm = ASSETS_DIR / "palm.onnx"
-    hand = ASSETS_DIR / "hand.onnx"
-    mp1 = ASSETS_DIR / "mp_palmdet.py"
-    mp2 = ASSETS_DIR / "mp_handpose.py"
 
-    _download_if_missing(PALM_ONNX_URL, palm)
-    _download_if_missing(HAND_ONNX_URL, hand)
-    _download_if_missing(MP_PALMDET_URL, mp1)
-    _download_if_missing(MP_HANDPOSE_URL, mp2)
+# Empreintes SHA-256 : épinglées localement (python -m src.modelStore pin <fichier>)
+# tant qu'elles ne sont pas renseignées ici ; les scripts mp_*.py sont importés
+# et ne doivent jamais l'être sans vérification
+PALM_ONNX = STORE.register(ModelAsset("palm_detection_mediapipe", "palm.onnx",
+                                      "https://huggingface.co/opencv/palm_detection_mediapipe/resolve/main/palm_detection_mediapipe_2023feb.onnx"))
+HAND_ONNX = STORE.register(ModelAsset("handpose_estimation_mediapipe", "hand.onnx",
+                                      "https://huggingface.co/opencv/handpose_estimation_mediapipe/resolve/main/handpose_estimation_mediapipe_2023feb.onnx"))
 
-    return palm, hand, mp1, mp2
+MP_PALMDET = STORE.register(ModelAsset("mp_palmdet", "mp_palmdet.py",
+                                       "https://huggingface.co/spaces/opencv/handpose_estimation_mediapipe/raw/main/mp_palmdet.py"))
+MP_HANDPOSE = STORE.register(ModelAsset("mp_handpose", "mp_handpose.py",
+                                        "https://huggingface.co/spaces/opencv/handpose_estimation_mediapipe/raw/main/mp_handpose.py"))
 
 
 def _import_helpers(p1: Path, p2: Path):
@@ -186,27 +264,125 @@ def _import_helpers(p1: Path, p2: Path):
     return load("_mp_palmdet", p1), load("_mp_handpose", p2)
 
 
-class HandPoseDetector:
+def _load_networks():
+    """
+    résout les fichiers via le magasin de modèles (cache local / miroir, sha256 vérifié)
+    et construit les deux réseaux ; appelé une seule fois par processus
+    """
+    palm = STORE.resolve(PALM_ONNX)
+    hand = STORE.resolve(HAND_ONNX)
+    palmdet_mod, handpose_mod = _import_helpers(STORE.resolve(MP_PALMDET), STORE.resolve(MP_HANDPOSE))
+    return (palmdet_mod.MPPalmDet(modelPath=str(palm)),
+            handpose_mod.MPHandPose(modelPath=str(hand)))
+
+
+# repères de la paume, dans l'ordre des 7 points renvoyés par le détecteur de paume
+# (poignet, base index, base majeur, base annulaire, base auriculaire, pouce CMC, pouce MCP)
+PALM_LANDMARK_IDS = [0, 5, 9, 13, 17, 1, 2]
+
+
+def palm_from_landmarks(lm, score=1.0):
+    """
+    reconstruit une "détection de paume" à partir des 21 points d'une main
+
+    même format que MPPalmDet : [x1, y1, x2, y2, 7 x (x, y), score]
+    permet de donner directement la ROI de l'image suivante à handpose.infer
+    """
+    pts = np.asarray(lm, dtype=np.float32)[PALM_LANDMARK_IDS]
+    x1, y1 = pts.min(axis=0)
+    x2, y2 = pts.max(axis=0)
+    return np.r_[x1, y1, x2, y2, pts.reshape(-1), score].astype(np.float32)
+
 
-    def __init__(self):
-        palm, hand, p1, p2 = _ensure_assets()
-        palmdet_mod, handpose_mod = _import_helpers(p1, p2)
+def suppress_overlaps(boxes, scores, iou_threshold):
+    """
+    suppression des non-maxima : indices des boîtes gardées, meilleur score d'abord
+
+    une boîte est écartée si son IoU avec une boîte déjà gardée dépasse iou_threshold
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    areas = np.clip(boxes[:, 2] - boxes[:, 0], 0, None) * np.clip(boxes[:, 3] - boxes[:, 1], 0, None)
+    order = np.argsort(-np.asarray(scores, dtype=np.float32), kind="stable")
+    keep = []
+    while len(order):
+        best, rest = order[0], order[1:]
+        keep.append(int(best))
+        x1 = np.maximum(boxes[best, 0], boxes[rest, 0])
+        y1 = np.maximum(boxes[best, 1], boxes[rest, 1])
+        x2 = np.minimum(boxes[best, 2], boxes[rest, 2])
+        y2 = np.minimum(boxes[best, 3], boxes[rest, 3])
+        inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+        iou = inter / np.maximum(areas[best] + areas[rest] - inter, 1e-6)
+        order = rest[iou <= iou_threshold]
+    return keep
 
-        self.palmdet = palmdet_mod.MPPalmDet(modelPath=str(palm))
-        self.handpose = handpose_mod.MPHandPose(modelPath=str(hand))
+
+class HandPoseDetector:
+
+    def __init__(self, track=True, refresh_interval=30, iou_threshold=0.5):
+        """
+        track : réutilise les points de l'image précédente comme ROI (comme MediaPipe)
+                au lieu de relancer le détecteur de paume à chaque image
+        refresh_interval : nombre max d'images suivies avant une détection de paume complète
+                           (pour repérer une nouvelle main entrant dans le champ)
+        iou_threshold : deux ROI suivies qui se recouvrent plus que ce seuil sont la même main,
+                        seule la plus sûre est gardée
+        """
+        # réseaux chargés à la première image seulement
+        self._networks = LazyModel(lambda: STORE.network("mediapipe-hands", _load_networks))
+
+        self.track = track
+        self.refresh_interval = refresh_interval
+        self.iou_threshold = iou_threshold
+        self._tracked_palms = []
+        self._frames_since_palmdet = 0
 
         self.last_results = []
 
+    @property
+    def palmdet(self):
+        return self._networks.get()[0]
+
+    @property
+    def handpose(self):
+        return self._networks.get()[1]
+
     def process(self, frame):
-        self.last_results = []
-        palms = self.palmdet.infer(frame)
+        tracking = (self.track and self._tracked_palms
+                    and self._frames_since_palmdet < self.refresh_interval)
+
+        if tracking:
+            results, palms, lost = self._infer_hands(frame, self._tracked_palms)
+            self._frames_since_palmdet += 1
+            if lost:
+                # main perdue : on repasse par le détecteur de paume sur cette image
+                tracking = False
+
+        if not tracking:
+            palms = self.palmdet.infer(frame)
+            self._frames_since_palmdet = 0
+            if palms is None or len(palms) == 0:
+                palms = []
+            results, palms, _ = self._infer_hands(frame, palms)
+
+        self.last_results = results
+        self._tracked_palms = palms
+        return self.last_results
 
-        if palms is None or len(palms) == 0:
-            return []
+    def _infer_hands(self, frame, palms):
+        """
+        lance le modèle de points sur chaque ROI
+
+        retour : (résultats, ROI pour l'image suivante, True si une main est perdue)
+        """
+        results = []
+        next_palms = []
+        lost = False
 
         for palm in palms:
             hand = self.handpose.infer(frame, palm)
             if hand is None:
+                lost = True
                 continue
 
             hand = np.asarray(hand).reshape(-1)
@@ -214,12 +390,21 @@ class HandPoseDetector:
             bbox = hand[0:4].astype(int)
             lm = hand[4:67].reshape(21, 3)[:, :2]
 
-            self.last_results.append({
+            results.append({
                 "bbox": tuple(bbox),
                 "kpts": lm
             })
+            next_palms.append(palm_from_landmarks(lm, hand[-1]))
 
-        return self.last_results
+        if len(next_palms) > 1:
+            # deux ROI peuvent converger sur la même main pendant le suivi :
+            # sans suppression, la main serait dupliquée jusqu'au prochain détecteur de paume
+            keep = suppress_overlaps([p[0:4] for p in next_palms], [p[-1] for p in next_palms],
+                                     self.iou_threshold)
+            results = [results[i] for i in keep]
+            next_palms = [next_palms[i] for i in keep]
+
+        return results, next_palms, lost
 
     def get_hands_box(self):
         return [r["bbox"] for r in self.last_results]
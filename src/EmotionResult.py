@@ -1,9 +1,20 @@
 import cv2
-from deepface import DeepFace
+import numpy as np
 import os
-from typing import List, Dict
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Tuple, Union
 from dataclasses import dataclass
 
+from src import faceBatch
+from src.modelRegistry import REGISTRY
+from src.instrumentation import METRICS
+from src.lazyImport import lazy_import
+
+# DeepFace (et TensorFlow) n'est importé qu'à la première analyse
+DeepFace = lazy_import('deepface.DeepFace')
+
 
 @dataclass
 class EmotionResult:
@@ -29,7 +40,8 @@ class EmotionDetector:
 
     def __init__(self, detector_backend: str = 'opencv',
                  enforce_detection: bool = False,
-                 actions: List[str] = None):
+                 actions: List[str] = None,
+                 preload: bool = False):
         """
         Initialise l'analyseur facial
 
@@ -37,11 +49,34 @@ class EmotionDetector:
             detector_backend: Backend de détection ('opencv', 'ssd', 'mtcnn', etc.)
             enforce_detection: Si True, lève une erreur si aucun visage détecté
             actions: Liste des analyses à effectuer ['emotion', 'age', 'gender', 'race']
+            preload: Si True, charge et préchauffe les modèles dès la construction
         """
         self.detector_backend = detector_backend
         self.enforce_detection = enforce_detection
         self.actions = actions or ['emotion', 'age']  # Par défaut: émotion + âge
         self._configure_tensorflow()
+        if preload:
+            self.warm_up()
+
+    def warm_up(self, background: bool = False):
+        """
+        Charge et préchauffe les modèles via le registre partagé
+
+        Args:
+            background: Si True, le chargement se fait dans un thread séparé
+
+        Returns:
+            Le thread de chargement si background, None sinon
+        """
+        if background:
+            return REGISTRY.warm_up_async(self.actions, self.detector_backend)
+        REGISTRY.warm_up(self.actions, self.detector_backend)
+        return None
+
+    @property
+    def is_ready(self) -> bool:
+        """True si tous les modèles sont chargés et préchauffés"""
+        return REGISTRY.is_ready(self.actions, self.detector_backend)
 
     @staticmethod
     def _configure_tensorflow():
@@ -76,19 +111,142 @@ class EmotionDetector:
             print(f"Erreur lors de l'analyse : {e}")
             return []
 
+    def analyze_batch(self, frames) -> List[List[EmotionResult]]:
+        """
+        Analyse plusieurs images en regroupant tous les visages dans un seul lot
+
+        La détection reste faite image par image, mais chaque modèle d'attribut
+        (émotion, âge...) n'est appelé qu'une fois pour l'ensemble des visages.
+
+        Args:
+            frames: Liste d'images à analyser (format numpy array)
+
+        Returns:
+            Une liste d'EmotionResult par image, dans le même ordre que frames
+        """
+        resultats = [[] for _ in frames]
+        visages = []
+        proprietaires = []  # (index de l'image, région du visage)
+
+        for index, frame in enumerate(frames):
+            try:
+                face_objs = DeepFace.extract_faces(
+                    frame,
+                    detector_backend=self.detector_backend,
+                    enforce_detection=self.enforce_detection
+                )
+            except Exception as e:
+                print(f"Erreur lors de la détection (image {index}) : {e}")
+                continue
+
+            for face_obj in face_objs:
+                face = face_obj['face']
+                if face.shape[0] == 0 or face.shape[1] == 0:
+                    continue
+                # DeepFace renvoie le visage en RGB, les modèles attendent du BGR
+                visages.append(faceBatch.preparer_visage(face[:, :, ::-1]))
+                proprietaires.append((index, face_obj['facial_area']))
+
+        if not visages:
+            return resultats
+
+        try:
+            predictions = faceBatch.predire_attributs(np.stack(visages), self.actions)
+        except Exception as e:
+            print(f"Erreur lors de l'analyse : {e}")
+            return resultats
+
+        for (index, region), prediction in zip(proprietaires, predictions):
+            prediction['region'] = region
+            resultats[index].append(EmotionResult.from_deepface_result(prediction))
+
+        return resultats
+
+    def detect_faces(self, frame) -> List[Dict[str, int]]:
+        """
+        Détecte les visages sans les classifier
+
+        Args:
+            frame: Image à analyser (format numpy array)
+
+        Returns:
+            Liste de régions {'x', 'y', 'w', 'h', 'confidence'}
+        """
+        try:
+            faces = REGISTRY.detector(self.detector_backend).detect_faces(frame)
+        except Exception as e:
+            print(f"Erreur lors de la détection : {e}")
+            return []
+        return [{'x': int(f.x), 'y': int(f.y), 'w': int(f.w), 'h': int(f.h),
+                 'confidence': float(f.confidence or 0.0)} for f in faces]
+
+    def classify_regions(self, frame, regions: List[Dict[str, int]]) -> List[EmotionResult]:
+        """
+        Classifie (émotions, âge...) des visages déjà localisés
+
+        Args:
+            frame: Image d'origine (format numpy array BGR)
+            regions: Régions des visages {'x', 'y', 'w', 'h'} dans frame
+
+        Returns:
+            Un EmotionResult par région valide
+        """
+        hauteur, largeur = frame.shape[:2]
+        visages = []
+        regions_valides = []
+        for region in regions:
+            x1, y1 = max(0, region['x']), max(0, region['y'])
+            x2 = min(largeur, region['x'] + region['w'])
+            y2 = min(hauteur, region['y'] + region['h'])
+            if x2 <= x1 or y2 <= y1:
+                continue
+            visages.append(faceBatch.preparer_visage(frame[y1:y2, x1:x2]))
+            regions_valides.append({'x': x1, 'y': y1, 'w': x2 - x1, 'h': y2 - y1})
+
+        if not visages:
+            return []
+
+        try:
+            predictions = faceBatch.predire_attributs(np.stack(visages), self.actions)
+        except Exception as e:
+            print(f"Erreur lors de l'analyse : {e}")
+            return []
+
+        for region, prediction in zip(regions_valides, predictions):
+            prediction['region'] = region
+        return [EmotionResult.from_deepface_result(p) for p in predictions]
+
 
 class VideoCapture:
     """Gestionnaire de capture vidéo"""
 
-    def __init__(self, camera_index: int = 0):
+    def __init__(self, camera_index: Union[int, str] = 0, threaded: bool = False,
+                 buffer_size: int = 2, frame_size: Tuple[int, int] = None):
         """
         Initialise la capture vidéo
 
         Args:
-            camera_index: Index de la caméra (0 par défaut)
+            camera_index: Index de la caméra (0 par défaut) ou chemin d'un fichier vidéo
+            threaded: Si True, un thread dédié lit la caméra en continu et read()
+                renvoie toujours la dernière image sans bloquer
+            buffer_size: Nombre d'images horodatées conservées en mode threaded
+            frame_size: Résolution (largeur, hauteur) demandée à la caméra
         """
         self.camera_index = camera_index
+        self.frame_size = frame_size
         self.cap = None
+        self.threaded = threaded
+
+        self._buffer = deque(maxlen=buffer_size)  # (frame_id, timestamp, frame)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = None  # Event d'arrêt du thread de capture en cours
+        self._next_id = 0
+        self._last_read_id = -1
+        self._last_grab_time = None
+
+        self.dropped_frames = 0
+        self.capture_fps = 0.0
 
     def start(self) -> bool:
         """
@@ -99,19 +257,98 @@ class VideoCapture:
         """
         self.cap = cv2.VideoCapture(self.camera_index)
         if not self.cap.isOpened():
-            print(f"Erreur : Impossible d'accéder à la caméra {self.camera_index}")
+            print(f"Erreur : Impossible d'accéder à la source vidéo {self.camera_index}")
             return False
+        if self.frame_size is not None:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_size[0])
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_size[1])
+
+        if self.threaded:
+            self._buffer.clear()
+            self._last_read_id = self._next_id - 1
+            self._last_grab_time = None
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._grab_loop, args=(self.cap, self._stop), daemon=True)
+            self._thread.start()
         return True
 
+    def _grab_loop(self, cap, stop: threading.Event):
+        """
+        Boucle du thread de capture : lit la caméra au rythme du matériel
+
+        Le thread possède la capture : c'est lui qui la libère en sortant, pour
+        ne jamais la fermer pendant un cap.read() en cours.
+        """
+        try:
+            while not stop.is_set():
+                with METRICS.timer('capture'):
+                    ret, frame = cap.read()
+                if not ret or stop.is_set():
+                    break
+
+                self._store(frame)
+        finally:
+            cap.release()
+
+    def _store(self, frame):
+        """Ajoute une image capturée au tampon"""
+        now = time.perf_counter()
+        with self._lock:
+            self._buffer.append((self._next_id, now, frame))
+            self._next_id += 1
+            if self._last_grab_time is not None and now > self._last_grab_time:
+                # Moyenne glissante exponentielle du débit de capture
+                fps = 1.0 / (now - self._last_grab_time)
+                self.capture_fps = fps if not self.capture_fps else 0.9 * self.capture_fps + 0.1 * fps
+            self._last_grab_time = now
+
     def read(self):
-        """Lit une frame de la vidéo"""
+        """Lit une frame de la vidéo (la plus récente en mode threaded)"""
         if self.cap is None:
             return False, None
-        return self.cap.read()
+        if not self.threaded:
+            return self.cap.read()
+
+        latest = self.read_latest(after_id=-1)
+        if latest is None:
+            return False, None
+        return True, latest[2]
+
+    def read_latest(self, after_id: int = None):
+        """
+        Renvoie la dernière image capturée sans jamais bloquer (mode threaded)
+
+        Args:
+            after_id: Ne renvoie une image que si son identifiant est supérieur
+                (par défaut : la dernière image déjà lue)
+
+        Returns:
+            (frame_id, timestamp, frame) ou None si aucune nouvelle image
+        """
+        with self._lock:
+            if not self._buffer:
+                return None
+            frame_id, timestamp, frame = self._buffer[-1]
+            if after_id is None:
+                after_id = self._last_read_id
+            if frame_id <= after_id:
+                return None
+
+            # Images capturées mais jamais consommées
+            if frame_id > self._last_read_id + 1:
+                self.dropped_frames += frame_id - self._last_read_id - 1
+            self._last_read_id = max(self._last_read_id, frame_id)
+            return frame_id, timestamp, frame
 
     def release(self):
         """Libère les ressources de la capture vidéo"""
-        if self.cap is not None:
+        if self._thread is not None:
+            # le thread de capture libère lui-même la capture en sortant de cap.read()
+            self._stop.set()
+            if self._thread is not threading.current_thread():
+                self._thread.join(timeout=1.0)
+            self._thread = None
+        elif self.cap is not None:
             self.cap.release()
 
 
@@ -1,73 +1,143 @@
-import matplotlib.pyplot as plt
+import threading
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+from src.streamingStats import DownsampledHistory, RingBuffer, RunningStats, WindowedCounter
+
+
 class EmotionStatistics:
-    def __init__(self):
+    def __init__(self, retention=1000, fenetre=300, points_max=512):
+        """
+        Statistiques d'une session à mémoire bornée
+
+        Args:
+            retention: Nombre de valeurs brutes (âges, scores) conservées
+            fenetre: Nombre de dernières analyses prises en compte par emotions_recentes
+            points_max: Nombre maximal de points de l'historique sous-échantillonné
+        """
         self.emotions_count = {}
-        self.ages = []
+        self.ages = RingBuffer(retention)
+        self.age_stats = RunningStats()
         self.total_stats = 0
-        self.historique_scores = []
+        self.historique_scores = RingBuffer(retention)
+        self.historique = DownsampledHistory(points_max)
+        self.emotions_recentes = WindowedCounter(fenetre)
+        # Incrémenté à chaque analyse : permet au graphique en direct de ne redessiner qu'en cas de changement
+        self.version = 0
+        self._lock = threading.Lock()
 
     def extraire_stats_essentielles(self, results):
         if not results:
             return
-        res = results[0]
+        with self._lock:
+            self._ajouter(results[0])
+
+    def _ajouter(self, res):
+        self.version += 1
         self.total_stats += 1
         self.ages.append(res.age)
+        self.age_stats.add(res.age)
         dom_emotion = res.dominant_emotion
         if dom_emotion in self.emotions_count:
             self.emotions_count[dom_emotion] += 1
         else:
             self.emotions_count[dom_emotion] = 1
+        self.emotions_recentes.add(dom_emotion)
         mapping_echelle = {
             'happy': 10, 'surprise': 5, 'neutral': 0,
             'fear': -4, 'sad': -7, 'disgust': -9, 'angry': -10
         }
         score_graphique = mapping_echelle.get(dom_emotion, 0)
-        if not hasattr(self, 'historique_scores'):
-            self.historique_scores = []
         self.historique_scores.append(score_graphique)
+        self.historique.add(score_graphique)
 
 
-    def generer_graphique_emotions(self):
-        if not hasattr(self, 'historique_scores') or not self.historique_scores:
-            print("Aucune donnée disponible pour générer le graphique.")
-            return
-        indices = range(len(self.historique_scores))
-
-        plt.figure(figsize=(10, 5))
-        plt.plot(indices, self.historique_scores, marker='o', color='#2c3e50', linewidth=2, label="Humeur")
-        plt.axhline(y=0, color='black', linestyle='--', alpha=0.3)
-
-        plt.ylim(-11, 11)
-        plt.yticks(
-            [-10, -7, -4, 0, 5, 10],
-            ['Angry (-10)', 'Sad (-7)', 'Fear (-4)', 'Neutral (0)', 'Surprise (5)', 'Happy (10)']
-        )
-
-        plt.title(f"Évolution des émotions (Total: {self.total_stats} analyses)")
-        plt.xlabel("Nombre de captures")
-        plt.ylabel("Variation des emotions")
-        plt.grid(axis='y', linestyle=':', alpha=0.6)
-
-        if self.ages:
-            age_moyen = sum(self.ages) / len(self.ages)
-            plt.figtext(0.15, 0.8, f"Âge moyen détecté : {age_moyen:.1f} ans", fontsize=10,
-                        bbox={"facecolor": "orange", "alpha": 0.2})
+    def instantane(self):
+        """
+        Copie cohérente des données utiles aux graphiques (prise sous verrou)
 
-        plt.savefig('datas/evolution_emotions.png')
-        self.generer_camembert_emotions()
+        Returns:
+            dict avec version, total, historique (positions, min, max, moyennes),
+            age_moyen, age_ecart_type, emotions_count, et les dernières valeurs
+            brutes (au plus retention) : ages_recents, scores_recents
+        """
+        with self._lock:
+            return {
+                'version': self.version,
+                'total': self.total_stats,
+                'historique': self.historique.buckets(),
+                'regroupe': self.historique.bucket_size > 1,
+                'age_moyen': self.age_stats.mean if self.age_stats.count else None,
+                'age_ecart_type': self.age_stats.std,
+                'emotions_count': dict(self.emotions_count),
+                'ages_recents': self.ages.values(),
+                'scores_recents': self.historique_scores.values(),
+            }
 
-    def generer_camembert_emotions(self):
-        if not self.emotions_count:
-            print("Aucune donnée d'émotion pour générer le camembert.")
-            return
-        labels = list(self.emotions_count.keys())
-        values = list(self.emotions_count.values())
+    @staticmethod
+    def preparer_axes_evolution(ax):
+        """Éléments fixes du graphique d'évolution (axes, graduations, grille)"""
+        ax.axhline(y=0, color='black', linestyle='--', alpha=0.3)
+        ax.set_ylim(-11, 11)
+        ax.set_yticks([-10, -7, -4, 0, 5, 10])
+        ax.set_yticklabels(['Angry (-10)', 'Sad (-7)', 'Fear (-4)', 'Neutral (0)', 'Surprise (5)', 'Happy (10)'])
+        ax.set_xlabel("Nombre de captures")
+        ax.set_ylabel("Variation des emotions")
+        ax.grid(axis='y', linestyle=':', alpha=0.6)
+
+    def dessiner_evolution(self, figure: 'Figure'):
+        """Dessine entièrement le graphique d'évolution dans figure"""
+        donnees = self.instantane()
+        indices, minimums, maximums, moyennes = donnees['historique']
+
+        figure.clear()
+        ax = figure.add_subplot()
+        self.preparer_axes_evolution(ax)
+        if donnees['regroupe']:
+            ax.fill_between(indices, minimums, maximums, color='#2c3e50', alpha=0.15, step='post')
+        ax.plot(indices, moyennes, marker='o', color='#2c3e50', linewidth=2, label="Humeur")
+        ax.set_title(f"Évolution des émotions (Total: {donnees['total']} analyses)")
+
+        if donnees['age_moyen'] is not None:
+            figure.text(0.15, 0.8, f"Âge moyen détecté : {donnees['age_moyen']:.1f} ans "
+                                   f"(± {donnees['age_ecart_type']:.1f})", fontsize=10,
+                        bbox={"facecolor": "orange", "alpha": 0.2})
+
+    def dessiner_camembert(self, figure: 'Figure'):
+        """Dessine le camembert de répartition des émotions dans figure"""
+        donnees = self.instantane()
+        labels = list(donnees['emotions_count'].keys())
+        values = list(donnees['emotions_count'].values())
 
         couleurs_map = {
             'happy': '#2ecc71','neutral': '#95a5a6','sad': '#3498db','fear': '#9b59b6','angry': '#e74c3c','surprise': '#f1c40f', 'disgust': '#1abc9c'
         }
         couleurs = [couleurs_map.get(emotion, '#bdc3c7') for emotion in labels]
-        plt.figure(figsize=(8, 8))
-        plt.pie(values,labels=labels,autopct='%1.1f%%',startangle=140,colors=couleurs,shadow=True)
-        plt.title(f"Répartition globale des émotions\n(Basé sur {self.total_stats} analyses)")
-        plt.savefig('datas/repartition_emotions_camembert.png')
+        figure.clear()
+        ax = figure.add_subplot()
+        ax.pie(values,labels=labels,autopct='%1.1f%%',startangle=140,colors=couleurs,shadow=True)
+        ax.set_title(f"Répartition globale des émotions\n(Basé sur {donnees['total']} analyses)")
+
+    def generer_graphique_emotions(self, figure: 'Figure' = None):
+        if not self.historique:
+            print("Aucune donnée disponible pour générer le graphique.")
+            return
+        # Figure (et non pyplot) : rien n'est conservé dans le registre global de matplotlib ;
+        # importée ici pour ne pas charger matplotlib au démarrage
+        from matplotlib.figure import Figure
+        figure = figure or Figure(figsize=(10, 5))
+        self.dessiner_evolution(figure)
+        figure.savefig('datas/evolution_emotions.png')
+        self.generer_camembert_emotions()
+
+    def generer_camembert_emotions(self, figure: 'Figure' = None):
+        if not self.emotions_count:
+            print("Aucune donnée d'émotion pour générer le camembert.")
+            return
+        from matplotlib.figure import Figure
+        figure = figure or Figure(figsize=(8, 8))
+        self.dessiner_camembert(figure)
+        figure.savefig('datas/repartition_emotions_camembert.png')
@@ -1,104 +1,163 @@
+import argparse
+from dataclasses import dataclass
 from pathlib import Path
 
 import cv2
-from ultralytics import YOLO
-
-# path to model file
-BASE_DIR = Path(__file__).resolve().parent
-MODEL_PATH = BASE_DIR / "../../model/best.pt"
-
-
-class HandPoseDetector:
-    def __init__(self, model_path=MODEL_PATH):
-        self.model = YOLO(model_path)
-        self.last_results = None
-
-    def detect(self, frame):
-        results = self.model(frame, conf=0.3, verbose=False)
-
+import numpy as np
+
+from src.modelStore import STORE, LazyModel, ModelAsset
+
+# model file, resolved through the model store (model/ folder, mirror or download);
+# best.pt is unpickled by torch, so it is only loaded once its SHA-256 is pinned
+YOLO_ASSET = STORE.register(ModelAsset("yolo-hand-pose", "best.pt",
+                                       "https://github.com/RionDsilvaCS/yolo-hand-pose/raw/main/model/best.pt"))
+
+# detection thresholds shared by every backend (IoU: Ultralytics' default NMS threshold)
+CONF_THRESHOLD = 0.3
+IOU_THRESHOLD = 0.7
+
+
+def _load_yolo(path):
+    # ultralytics is slow to import: only done when the first frame arrives
+    from ultralytics import YOLO
+    return YOLO(str(path))
+
+
+@dataclass(frozen=True)
+class HandPoseResult:
+    """
+    Hands found on one frame, computed once by HandPoseDetector.process
+    (arrays are read-only so the result can be shared between threads)
+    """
+    keypoints: np.ndarray  # (N, 21, 2) x, y in pixels
+    boxes: np.ndarray  # (N, 4) x1, y1, x2, y2 around the keypoints
+    confidences: np.ndarray  # (N,)
+
+    @classmethod
+    def empty(cls, num_keypoints=21):
+        return cls.from_arrays(np.zeros((0, num_keypoints, 2), np.float32), np.zeros(0, np.float32))
+
+    @classmethod
+    def from_arrays(cls, keypoints, confidences):
+        keypoints = np.ascontiguousarray(keypoints, dtype=np.float32)
+        # box around the hand calculated by the points, for all hands at once
+        boxes = np.concatenate([keypoints.min(axis=1), keypoints.max(axis=1)], axis=1) \
+            if len(keypoints) else np.zeros((0, 4), np.float32)
+        confidences = np.asarray(confidences, dtype=np.float32).reshape(-1)
+        for array in (keypoints, boxes, confidences):
+            array.setflags(write=False)
+        return cls(keypoints, boxes, confidences)
+
+    @classmethod
+    def from_yolo(cls, results):
+        keypoints, confidences = [], []
         for r in results:
             if r.keypoints is None:
                 continue
-
             kpts = r.keypoints.xy.cpu().numpy()
+            keypoints.append(kpts)
+            confidences.append(r.boxes.conf.cpu().numpy() if r.boxes is not None else np.ones(len(kpts)))
+        if not keypoints:
+            return cls.empty()
+        return cls.from_arrays(np.concatenate(keypoints), np.concatenate(confidences))
 
-            for hand in kpts:
-                # Draw the points on the hand
-                for (x, y) in hand:
-                    cv2.circle(
-                        frame,
-                        (int(x), int(y)),
-                        4,
-                        (0, 0, 255),
-                        -1
-                    )
-                # box around the hand calculated by the points
-                x1, y1 = hand[:, 0].min(), hand[:, 1].min()
-                x2, y2 = hand[:, 0].max(), hand[:, 1].max()
-
-                cv2.rectangle(
-                    frame,
-                    (int(x1), int(y1)),
-                    (int(x2), int(y2)),
-                    (0, 255, 0),
-                    2
-                )
-
-        return frame
-
-    def process(self, frame):
-        """
-        Lance YOLO UNE FOIS et stocke les résultats
-        """
-        self.last_results = self.model(frame, conf=0.3, verbose=False)
-        return self.last_results
+    def __len__(self):
+        return len(self.keypoints)
 
-    def get_hands_box(self):
-        """
-        Retourne [(x1, y1, x2, y2), ...]
-        """
-        box = []
+    def scaled(self, sx, sy):
+        """Same hands in another image size (e.g. camera frame -> game window)"""
+        return HandPoseResult.from_arrays(self.keypoints * np.array([sx, sy], np.float32), self.confidences)
 
-        if self.last_results is None:
-            return box
+    def int_boxes(self):
+        """[(x1, y1, x2, y2), ...] as ints"""
+        return [tuple(box) for box in self.boxes.astype(int).tolist()]
 
-        for r in self.last_results:
-            if r.keypoints is None:
-                continue
 
-            kpts = r.keypoints.xy.cpu().numpy()
-            for hand in kpts:
-                x1, y1 = int(hand[:, 0].min()), int(hand[:, 1].min())
-                x2, y2 = int(hand[:, 0].max()), int(hand[:, 1].max())
-                box.append((x1, y1, x2, y2))
+def draw_result(frame, result: HandPoseResult):
+    """Draw keypoints and boxes of a result on the frame (in place)"""
+    for hand, (x1, y1, x2, y2) in zip(result.keypoints.astype(int), result.int_boxes()):
+        # Draw the points on the hand
+        for (x, y) in hand.tolist():
+            cv2.circle(frame, (x, y), 4, (0, 0, 255), -1)
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+    return frame
 
-        return box
 
-    def draw(self, frame):
-        if self.last_results is None:
-            return frame
+BACKENDS = ("torch", "onnx", "onnx-int8")
 
-        for r in self.last_results:
-            if r.keypoints is None:
-                continue
 
-            kpts = r.keypoints.xy.cpu().numpy()
+class HandPoseDetector:
+    def __init__(self, model_path=None, backend="torch", imgsz=320, runtime="onnxruntime"):
+        """
+        model_path : explicit weights file; by default best.pt from the model store
+        backend : "torch" (Ultralytics), or "onnx" / "onnx-int8" : best.pt exported once
+                  to ONNX (int8 weights for onnx-int8), no torch needed once exported
+        imgsz : input size of the exported model
+        runtime : "onnxruntime" or "opencv" (cv2.dnn) for the ONNX backends
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}")
+        self.model_path = Path(model_path) if model_path else None
+        self.backend = backend
+        self.imgsz = imgsz
+        self.runtime = runtime
+        self.model = LazyModel(self._load)
+        # last HandPoseResult, replaced (never modified) by process
+        self.result = HandPoseResult.empty()
+
+    def _load(self):
+        path = self.model_path or STORE.resolve(YOLO_ASSET)
+        if self.backend == "torch":
+            # one network per weights file for the whole process
+            return STORE.network(("yolo", str(Path(path).resolve())), lambda: _load_yolo(path))
+
+        from src.IA.onnxHandPose import OnnxHandPoseModel, export_onnx
+        onnx_path = export_onnx(path, self.imgsz, int8=self.backend == "onnx-int8")
+        return STORE.network(("yolo-onnx", str(onnx_path), self.runtime),
+                             lambda: OnnxHandPoseModel(onnx_path, self.imgsz, CONF_THRESHOLD, IOU_THRESHOLD,
+                                                       runtime=self.runtime))
 
-            for hand in kpts:
-                for (x, y) in hand:
-                    cv2.circle(frame, (int(x), int(y)), 4, (0, 0, 255), -1)
+    def detect(self, frame):
+        self.process(frame)
+        return self.draw(frame)
 
-                x1, y1 = int(hand[:, 0].min()), int(hand[:, 1].min())
-                x2, y2 = int(hand[:, 0].max()), int(hand[:, 1].max())
+    def process(self, frame) -> HandPoseResult:
+        """
+        Lance YOLO UNE FOIS et convertit les résultats en HandPoseResult
+        """
+        if self.backend == "torch":
+            predictions = self.model(frame, conf=CONF_THRESHOLD, iou=IOU_THRESHOLD, verbose=False)
+            self.result = HandPoseResult.from_yolo(predictions)
+        else:
+            self.result = HandPoseResult.from_arrays(*self.model.infer(frame))
+        return self.result
 
-                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+    def get_hands_box(self):
+        """
+        Retourne [(x1, y1, x2, y2), ...]
+        """
+        return self.result.int_boxes()
 
-        return frame
+    def draw(self, frame, result: HandPoseResult = None):
+        """
+        result : result to draw (by default the last one from process)
+        """
+        return draw_result(frame, self.result if result is None else result)
 
 
 # Just below ,the exemple on how use the model
 def main():
-    detector = HandPoseDetector()
+    parser = argparse.ArgumentParser(description="Hand pose detection demo")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch")
+    parser.add_argument("--imgsz", type=int, default=320, help="input size of the ONNX model")
+    parser.add_argument("--runtime", choices=["onnxruntime", "opencv"], default="onnxruntime")
+    parser.add_argument("--export-only", action="store_true", help="export the ONNX model and exit")
+    args = parser.parse_args()
+
+    detector = HandPoseDetector(backend=args.backend, imgsz=args.imgsz, runtime=args.runtime)
+    if args.export_only:
+        detector.model.get()
+        return
 
     cap = cv2.VideoCapture(0)
     if not cap.isOpened():
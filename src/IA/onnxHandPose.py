@@ -0,0 +1,169 @@
+import ast
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.IA.handDetector import CONF_THRESHOLD, IOU_THRESHOLD
+from src.modelStore import STORE, ModelAsset, sha256_of
+
+# grey used by Ultralytics to pad letterboxed images
+PAD_VALUE = 114
+# class offset applied to the boxes so that NMS stays per class (as Ultralytics does)
+MAX_WH = 7680
+
+
+def exported_asset(pt_path, imgsz=320, int8=False) -> ModelAsset:
+    """
+    Store entry of the ONNX file exported from a .pt file
+
+    The file name contains the start of the weights' SHA-256: a retrained
+    best.pt gets a new export instead of reusing the stale one.
+    """
+    stem = Path(pt_path).stem
+    key = sha256_of(pt_path)[:12]
+    suffix = "_int8" if int8 else ""
+    return ModelAsset(f"{stem}-onnx-{imgsz}{suffix}", f"{stem}_{key}_{imgsz}{suffix}.onnx")
+
+
+def export_onnx(pt_path, imgsz=320, int8=False) -> Path:
+    """
+    Export the YOLO weights to ONNX once (then optionally quantise to int8)
+
+    The files are kept in the model store folder and checked like any other
+    model: being generated here, their hash is pinned right after the export.
+    torch/ultralytics are only needed the first time.
+    """
+    asset = exported_asset(pt_path, imgsz, int8)
+    target = STORE.cache_dir / asset.filename
+    if target.exists():
+        return STORE.resolve(asset)
+
+    if int8:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        fp32 = export_onnx(pt_path, imgsz, int8=False)
+        print("quantize:", fp32.name, "->", target.name)
+        quantize_dynamic(str(fp32), str(target), weight_type=QuantType.QUInt8)
+    else:
+        from ultralytics import YOLO
+        print("export:", Path(pt_path).name, "->", target.name)
+        exported = YOLO(str(pt_path)).export(format="onnx", imgsz=imgsz, dynamic=False)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        Path(exported).replace(target)
+    STORE.pin(asset, target)
+    return STORE.resolve(asset)
+
+
+def read_metadata(onnx_path) -> dict:
+    """Metadata written by the Ultralytics export (names, kpt_shape...), empty without the onnx package"""
+    try:
+        import onnx
+    except ImportError:
+        return {}
+    model = onnx.load(str(onnx_path), load_external_data=False)
+    return {prop.key: prop.value for prop in model.metadata_props}
+
+
+class OnnxHandPoseModel:
+    """
+    YOLO pose model exported to ONNX, run by onnxruntime or cv2.dnn
+
+    Input tensor and letterbox canvas are allocated once; infer() returns
+    keypoints with the same shape as Ultralytics' keypoints.xy, in pixels of
+    the original frame.
+    """
+
+    def __init__(self, onnx_path, imgsz=320, conf=CONF_THRESHOLD, iou=IOU_THRESHOLD, runtime="onnxruntime",
+                 num_keypoints=21):
+        self.imgsz = imgsz
+        self.conf = conf
+        self.iou = iou
+        self.runtime = runtime
+        self.num_keypoints = num_keypoints
+
+        if runtime == "onnxruntime":
+            import onnxruntime as ort
+            self.session = ort.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+            self.input_name = self.session.get_inputs()[0].name
+            metadata = self.session.get_modelmeta().custom_metadata_map
+        else:
+            self.net = cv2.dnn.readNetFromONNX(str(onnx_path))
+            metadata = read_metadata(onnx_path)
+
+        # number of classes and keypoint shape written by the Ultralytics export;
+        # checked against the output tensor on the first inference
+        self.num_classes = len(ast.literal_eval(metadata["names"])) if "names" in metadata else None
+        kpt_shape = ast.literal_eval(metadata["kpt_shape"]) if "kpt_shape" in metadata else (num_keypoints, 3)
+        if kpt_shape[0] != num_keypoints:
+            raise ValueError(f"{onnx_path}: model has {kpt_shape[0]} keypoints, expected {num_keypoints}")
+        self.keypoint_dims = kpt_shape[1]
+        self._layout_checked = False
+
+        # preallocated buffers
+        self._input = np.zeros((1, 3, imgsz, imgsz), dtype=np.float32)
+        self._canvas = np.full((imgsz, imgsz, 3), PAD_VALUE, dtype=np.uint8)
+        self._resized = None
+        self._geometry = None  # (frame size, scale, left, top)
+
+    def _letterbox(self, frame):
+        h, w = frame.shape[:2]
+        if self._geometry is None or self._geometry[0] != (w, h):
+            scale = min(self.imgsz / h, self.imgsz / w)
+            nw, nh = int(round(w * scale)), int(round(h * scale))
+            left, top = (self.imgsz - nw) // 2, (self.imgsz - nh) // 2
+            self._canvas[:] = PAD_VALUE
+            self._resized = np.empty((nh, nw, 3), dtype=np.uint8)
+            self._geometry = ((w, h), scale, left, top)
+
+        _, scale, left, top = self._geometry
+        nh, nw = self._resized.shape[:2]
+        cv2.resize(frame, (nw, nh), dst=self._resized, interpolation=cv2.INTER_LINEAR)
+        self._canvas[top:top + nh, left:left + nw] = self._resized
+        # BGR HWC uint8 -> RGB CHW float in [0, 1], written into the input tensor
+        np.divide(self._canvas[..., ::-1].transpose(2, 0, 1), 255.0, out=self._input[0])
+        return scale, left, top
+
+    def _forward(self):
+        if self.runtime == "onnxruntime":
+            return self.session.run(None, {self.input_name: self._input})[0]
+        self.net.setInput(self._input)
+        return self.net.forward()
+
+    def _check_layout(self, channels):
+        """Number of classes from the output channels (4 + nc + K * D), consistent with the metadata"""
+        num_classes = channels - 4 - self.num_keypoints * self.keypoint_dims
+        if num_classes < 1 or (self.num_classes is not None and num_classes != self.num_classes):
+            raise ValueError(f"unexpected YOLO pose output: {channels} channels for {self.num_classes} classes "
+                             f"and {self.num_keypoints}x{self.keypoint_dims} keypoints")
+        self.num_classes = num_classes
+
+    def infer(self, frame):
+        """
+        Returns:
+            (keypoints (N, 21, 2), confidences (N,)) in frame coordinates
+        """
+        scale, left, top = self._letterbox(frame)
+        # (1, 4 + nc + K * D, anchors) -> (anchors, 4 + nc + K * D)
+        preds = self._forward()[0].T
+        if not self._layout_checked:
+            self._check_layout(preds.shape[1])
+            self._layout_checked = True
+
+        nc = self.num_classes
+        class_scores = preds[:, 4:4 + nc]
+        classes = class_scores.argmax(axis=1)
+        scores = class_scores[np.arange(len(preds)), classes]
+        keep = scores > self.conf
+        preds, scores, classes = preds[keep], scores[keep], classes[keep]
+        if len(preds) == 0:
+            return np.zeros((0, self.num_keypoints, 2), np.float32), np.zeros(0, np.float32)
+
+        boxes = preds[:, :4].copy()
+        boxes[:, :2] -= boxes[:, 2:] / 2  # cx, cy, w, h -> x, y, w, h
+        boxes[:, :2] += classes[:, None] * MAX_WH
+        indices = np.asarray(cv2.dnn.NMSBoxes(boxes.tolist(), scores.tolist(), self.conf, self.iou),
+                             dtype=int).reshape(-1)
+
+        kpts = preds[indices, 4 + nc:].reshape(len(indices), self.num_keypoints, self.keypoint_dims)[..., :2]
+        kpts = (kpts - np.array([left, top], dtype=np.float32)) / scale
+        return kpts.astype(np.float32), scores[indices].astype(np.float32)
@@ -0,0 +1,276 @@
+import heapq
+import threading
+import time
+from dataclasses import dataclass, field
+from queue import Empty, Full, Queue
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from src.EmotionResult import EmotionResult
+from src.instrumentation import METRICS
+
+# Signal d'arrêt envoyé à chaque worker
+_STOP = object()
+
+
+@dataclass
+class AnalysisOutput:
+    """Résultats d'analyse rattachés à l'image dont ils proviennent"""
+    frame_id: int
+    timestamp: float  # instant de capture (time.perf_counter)
+    latency: float  # délai capture -> résultat, en secondes
+    results: List[EmotionResult] = field(default_factory=list)
+
+
+class ResultSequencer:
+    """
+    Transmet chaque résultat au rappel dans l'ordre des frame_id, même si les
+    workers terminent dans le désordre ; une image abandonnée (remplacée dans
+    la file, erreur d'analyse) ne bloque pas les suivantes.
+    """
+
+    def __init__(self, callback: Optional[Callable[[AnalysisOutput], None]]):
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._waiting = []  # tas des frame_id attendus
+        self._expected = set()
+        self._done = {}  # frame_id -> AnalysisOutput, ou None si abandonnée
+
+    def expect(self, frame_id: int):
+        """Une image vient d'être soumise : son résultat sera attendu"""
+        with self._lock:
+            if frame_id not in self._expected:
+                self._expected.add(frame_id)
+                heapq.heappush(self._waiting, frame_id)
+
+    def abandon(self, frame_id: int):
+        """L'image ne produira pas de résultat"""
+        self._finish(frame_id, None)
+
+    def deliver(self, output: AnalysisOutput):
+        self._finish(output.frame_id, output)
+
+    def _finish(self, frame_id: int, output: Optional[AnalysisOutput]):
+        with self._lock:
+            if frame_id not in self._expected:
+                return
+            self._done[frame_id] = output
+            self._flush()
+
+    def _flush(self):
+        while self._waiting and self._waiting[0] in self._done:
+            frame_id = heapq.heappop(self._waiting)
+            self._expected.discard(frame_id)
+            output = self._done.pop(frame_id)
+            if output is not None and self.callback is not None:
+                self.callback(output)
+
+    def close(self):
+        """Transmet les résultats déjà reçus et oublie les images encore en cours"""
+        with self._lock:
+            for frame_id in self._waiting:
+                self._done.setdefault(frame_id, None)
+            self._flush()
+
+
+class FramePool:
+    """
+    Tampons d'images préalloués : chaque image soumise est copiée dans un
+    tampon libre puis le tampon est rendu une fois l'image analysée ou
+    abandonnée, sans allocation à chaque image.
+    """
+
+    def __init__(self, size: int):
+        """
+        Args:
+            size: Nombre maximal de tampons (images en file ou en cours d'analyse)
+        """
+        self.size = size
+        self._lock = threading.Lock()
+        self._free = []
+        self._allocated = 0
+
+    def acquire(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """Copie frame dans un tampon libre ; None si tous sont utilisés"""
+        with self._lock:
+            if self._free:
+                buffer = self._free.pop()
+            elif self._allocated < self.size:
+                self._allocated += 1
+                buffer = None
+            else:
+                return None
+        # tampon réalloué seulement si la résolution de la caméra change
+        if buffer is None or buffer.shape != frame.shape or buffer.dtype != frame.dtype:
+            buffer = np.empty_like(frame)
+        np.copyto(buffer, frame)
+        return buffer
+
+    def release(self, buffer: np.ndarray):
+        with self._lock:
+            self._free.append(buffer)
+
+
+class AnalysisPipeline:
+    """
+    Étage d'analyse piloté par événements : files bloquantes, N workers
+    d'inférence et politique « le plus récent gagne » en sortie.
+
+    Avec locate, un seul thread localise les visages image après image (le
+    suivi a besoin d'images consécutives), puis seule la classification est
+    répartie entre les workers.
+    """
+
+    def __init__(self, analyzer_factory: Callable[[], Callable], workers: int = 2,
+                 on_result: Optional[Callable[[AnalysisOutput], None]] = None,
+                 locate: Optional[Callable] = None):
+        """
+        Initialise le pipeline
+
+        Args:
+            analyzer_factory: Fonction créant, pour chaque worker, une fonction
+                d'analyse frame -> List[EmotionResult], ou (frame, régions) ->
+                List[EmotionResult] si locate est fourni
+            workers: Nombre de threads d'inférence
+            on_result: Rappel appelé (depuis un worker) pour chaque résultat d'analyse,
+                y compris ceux arrivés trop tard pour l'affichage, toujours dans
+                l'ordre croissant des frame_id
+            locate: Étape séquentielle frame -> régions des visages (FaceTracker.locate),
+                exécutée dans l'ordre des images par un thread unique
+        """
+        self.analyzer_factory = analyzer_factory
+        self.workers = workers
+        self.on_result = on_result
+        self.locate = locate
+
+        self._input = Queue(maxsize=workers)
+        self._track_input = Queue(maxsize=1)
+        # une image par place dans les files et par étage en cours, plus celle en cours de soumission
+        self._pool = FramePool(2 * workers + (2 if locate is not None else 0) + 1)
+        self._tracker = None
+        self._threads = []
+        self._lock = threading.Lock()
+        self._latest: Optional[AnalysisOutput] = None
+        self._sequencer = ResultSequencer(on_result)
+
+        self.dropped_frames = 0  # images remplacées avant d'être analysées
+        self.stale_results = 0  # résultats arrivés après un résultat plus récent
+
+    def start(self):
+        """Démarre le thread de suivi (si locate) et les workers d'inférence"""
+        self._latest = None
+        self._sequencer = ResultSequencer(self.on_result)
+        if self.locate is not None:
+            self._tracker = threading.Thread(target=self._track, name="analysis-track", daemon=True)
+            self._tracker.start()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"analysis-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, frame_id: int, timestamp: float, frame) -> None:
+        """
+        Soumet une image sans jamais bloquer ; si la file est pleine, la plus
+        ancienne image en attente est remplacée. L'image est copiée dans un
+        tampon du pipeline : l'appelant peut ensuite dessiner dessus.
+        """
+        buffer = self._pool.acquire(frame)
+        if buffer is None:
+            self.dropped_frames += 1
+            return
+        self._sequencer.expect(frame_id)
+        queue = self._track_input if self.locate is not None else self._input
+        self._put_latest(queue, (frame_id, timestamp, buffer, time.perf_counter(), None))
+
+    def _put_latest(self, queue: Queue, item):
+        while True:
+            try:
+                queue.put_nowait(item)
+                return
+            except Full:
+                try:
+                    dropped = queue.get_nowait()
+                    self.dropped_frames += 1
+                    self._discard(dropped)
+                except Empty:
+                    pass
+
+    def latest(self) -> Optional[AnalysisOutput]:
+        """Dernier résultat publié (ou None)"""
+        return self._latest
+
+    def _track(self):
+        while True:
+            item = self._track_input.get()
+            if item is _STOP:
+                break
+            frame_id, timestamp, frame, submitted, _ = item
+            try:
+                with METRICS.timer('locate'):
+                    regions = self.locate(frame)
+            except Exception as e:
+                print(f"Erreur lors de la localisation des visages : {e}")
+                self._discard(item)
+                continue
+            self._put_latest(self._input, (frame_id, timestamp, frame, submitted, regions))
+
+    def _worker(self):
+        analyze = self.analyzer_factory()
+        while True:
+            item = self._input.get()
+            if item is _STOP:
+                break
+            frame_id, timestamp, frame, submitted, regions = item
+            METRICS.observe('queue_wait', time.perf_counter() - submitted)
+            try:
+                with METRICS.timer('analysis'):
+                    results = analyze(frame) if self.locate is None else analyze(frame, regions)
+            except Exception as e:
+                print(f"Erreur lors de l'analyse : {e}")
+                self._sequencer.abandon(frame_id)
+                continue
+            finally:
+                self._pool.release(frame)
+            self._publish(AnalysisOutput(frame_id, timestamp, time.perf_counter() - timestamp, results))
+
+    def _publish(self, output: AnalysisOutput):
+        METRICS.observe('result_latency', output.latency)
+        # Statistiques / enregistrement : tous les résultats, remis dans l'ordre
+        self._sequencer.deliver(output)
+        # Affichage : « le plus récent gagne »
+        with self._lock:
+            if self._latest is not None and output.frame_id <= self._latest.frame_id:
+                self.stale_results += 1
+                return
+            self._latest = output
+
+    def _discard(self, item):
+        """Abandonne l'image d'un élément de file et rend son tampon"""
+        self._sequencer.abandon(item[0])
+        self._pool.release(item[2])
+
+    def _drain(self, queue: Queue):
+        """Abandonne les images encore en attente dans queue"""
+        while True:
+            try:
+                item = queue.get_nowait()
+            except Empty:
+                return
+            if item is not _STOP:
+                self._discard(item)
+
+    def stop(self, timeout: float = 2.0):
+        """Vide les files d'entrée, arrête le suivi et les workers et attend leur fin"""
+        if self._tracker is not None:
+            self._drain(self._track_input)
+            self._track_input.put(_STOP)
+            self._tracker.join(timeout=timeout)
+            self._tracker = None
+        self._drain(self._input)
+        for _ in self._threads:
+            self._input.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+        self._sequencer.close()
@@ -0,0 +1,260 @@
+"""
+Analyse hors ligne (sans interface) de fichiers vidéo ou de dossiers d'images.
+
+Exemple :
+    python -m src.batchAnalysis enregistrement.mp4 -o resultats.jsonl --workers 4 --resume
+"""
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import cv2
+
+import src.EmotionResult as ER
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp'}
+
+
+def iter_frames(source: Path, start: int = 0) -> Iterator[Tuple[int, float, object]]:
+    """
+    Parcourt les images d'une vidéo ou d'un dossier
+
+    Args:
+        source: Fichier vidéo ou dossier d'images
+        start: Index de la première image à produire (reprise)
+
+    Returns:
+        Itérateur de (index, horodatage en secondes, image BGR)
+    """
+    if source.is_dir():
+        images = sorted(p for p in source.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+        for index, path in enumerate(images[start:], start=start):
+            frame = cv2.imread(str(path))
+            if frame is None:
+                print(f"Image illisible ignorée : {path}")
+                continue
+            yield index, float(index), frame
+        return
+
+    capture = ER.VideoCapture(str(source))
+    if not capture.start():
+        return
+    try:
+        # grab() saute les images déjà traitées sans les décoder entièrement
+        for _ in range(start):
+            if not capture.cap.grab():
+                return
+        index = start
+        while True:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            yield index, capture.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0, frame
+            index += 1
+    finally:
+        capture.release()
+
+
+def _json_default(value):
+    # Types numpy (np.float32, np.int64...) renvoyés par DeepFace
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+def _frame_record(index: int, timestamp: float, results: List[ER.EmotionResult]) -> dict:
+    return {
+        'frame': index,
+        'timestamp': timestamp,
+        'faces': [asdict(r) for r in results],
+    }
+
+
+class JsonlWriter:
+    """Écrit un enregistrement JSON par image analysée"""
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = path
+        self.next_frame = self._last_frame() + 1 if resume else 0
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _last_frame(self) -> int:
+        """Dernier index complet du fichier (une ligne tronquée est supprimée)"""
+        if not self.path.exists():
+            return -1
+        last = -1
+        valid_size = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    last = json.loads(line)['frame']
+                except (ValueError, KeyError):
+                    break
+                valid_size += len(line)
+        with open(self.path, 'r+b') as f:
+            f.truncate(valid_size)
+        return last
+
+    def write(self, record: dict):
+        self._file.write(json.dumps(record, default=_json_default) + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """Écrit les enregistrements par blocs dans un dossier de fichiers Parquet"""
+
+    def __init__(self, path: Path, resume: bool = False, rows_per_file: int = 1000):
+        import pandas as pd
+        self._pd = pd
+        self.path = path
+        self.rows_per_file = rows_per_file
+        self._rows = []
+
+        if not resume and path.exists():
+            for part in path.glob('part-*.parquet'):
+                part.unlink()
+        path.mkdir(parents=True, exist_ok=True)
+        self._parts = len(list(path.glob('part-*.parquet')))
+        self.next_frame = self._last_frame() + 1 if self._parts else 0
+
+    def _last_frame(self) -> int:
+        frames = self._pd.read_parquet(self.path, columns=['frame'])['frame']
+        return int(frames.max()) if len(frames) else -1
+
+    def write(self, record: dict):
+        self._rows.append({
+            'frame': record['frame'],
+            'timestamp': record['timestamp'],
+            'faces': json.dumps(record['faces'], default=_json_default),
+        })
+        if len(self._rows) >= self.rows_per_file:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        self._pd.DataFrame(self._rows).to_parquet(self.path / f'part-{self._parts:05d}.parquet', index=False)
+        self._parts += 1
+        self._rows = []
+
+    def close(self):
+        self._flush()
+
+
+class BatchAnalyzer:
+    """Distribue les images sur un pool d'EmotionDetector en conservant l'ordre de sortie"""
+
+    def __init__(self, workers: int = 4, batch_size: int = 8, detector_backend: str = 'opencv',
+                 actions: List[str] = None):
+        """
+        Args:
+            workers: Nombre de threads d'analyse
+            batch_size: Nombre d'images regroupées par appel à analyze_batch
+            detector_backend: Backend de détection DeepFace
+            actions: Analyses à effectuer ['emotion', 'age', ...]
+        """
+        self.workers = workers
+        self.batch_size = batch_size
+        self.detector_backend = detector_backend
+        self.actions = actions
+        self._local = threading.local()
+
+    def _detector(self) -> ER.EmotionDetector:
+        # Un analyseur par thread, les réseaux restent partagés via le registre
+        if not hasattr(self._local, 'detector'):
+            self._local.detector = ER.EmotionDetector(detector_backend=self.detector_backend,
+                                                      actions=self.actions)
+        return self._local.detector
+
+    def _analyze_chunk(self, chunk):
+        frames = [frame for _, _, frame in chunk]
+        results = self._detector().analyze_batch(frames)
+        return [_frame_record(index, ts, r) for (index, ts, _), r in zip(chunk, results)]
+
+    def _chunks(self, frames):
+        chunk = []
+        for item in frames:
+            chunk.append(item)
+            if len(chunk) == self.batch_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def run(self, source: Path, writer, report_every: float = 5.0) -> dict:
+        """
+        Analyse toute la source et écrit les résultats dans l'ordre des images
+
+        Returns:
+            Statistiques de débit {'frames', 'seconds', 'fps'}
+        """
+        ER.EmotionDetector(detector_backend=self.detector_backend, actions=self.actions).warm_up()
+
+        start = time.perf_counter()
+        last_report = start
+        done = 0
+        pending = deque()
+        max_pending = 2 * self.workers
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for chunk in self._chunks(iter_frames(source, writer.next_frame)):
+                pending.append(pool.submit(self._analyze_chunk, chunk))
+                # Fenêtre bornée : on écrit le plus ancien lot avant d'en soumettre d'autres
+                while len(pending) >= max_pending or (pending and pending[0].done()):
+                    for record in pending.popleft().result():
+                        writer.write(record)
+                        done += 1
+
+                now = time.perf_counter()
+                if now - last_report >= report_every:
+                    print(f"{done} images analysées ({done / (now - start):.1f} img/s)")
+                    last_report = now
+
+            while pending:
+                for record in pending.popleft().result():
+                    writer.write(record)
+                    done += 1
+
+        elapsed = time.perf_counter() - start
+        stats = {'frames': done, 'seconds': elapsed, 'fps': done / elapsed if elapsed > 0 else 0.0}
+        print(f"Terminé : {done} images en {elapsed:.1f}s ({stats['fps']:.1f} img/s)")
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse hors ligne des émotions et de l'âge")
+    parser.add_argument('source', type=Path, help="Fichier vidéo ou dossier d'images")
+    parser.add_argument('-o', '--output', type=Path, required=True,
+                        help="Fichier .jsonl ou dossier Parquet de sortie")
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], default='jsonl')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--backend', default='opencv', help="Backend de détection DeepFace")
+    parser.add_argument('--actions', nargs='+', default=['emotion', 'age'])
+    parser.add_argument('--resume', action='store_true', help="Reprend après la dernière image écrite")
+    args = parser.parse_args()
+
+    if args.format == 'parquet':
+        writer = ParquetWriter(args.output, resume=args.resume)
+    else:
+        writer = JsonlWriter(args.output, resume=args.resume)
+
+    if writer.next_frame:
+        print(f"Reprise à l'image {writer.next_frame}")
+
+    analyzer = BatchAnalyzer(workers=args.workers, batch_size=args.batch_size,
+                             detector_backend=args.backend, actions=args.actions)
+    try:
+        analyzer.run(args.source, writer)
+    finally:
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Banc d'essai reproductible (sans caméra) des détecteurs, des gestes et de la boucle de jeu.
+
+Exemples :
+    python -m src.benchmark                          # toutes les suites, images synthétiques
+    python -m src.benchmark --suite emotion --source enregistrement.mp4
+    python -m src.benchmark --save-baseline          # enregistre la référence
+"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import cv2
+import numpy as np
+
+BASELINE_PATH = Path(__file__).resolve().parent.parent / "datas" / "benchmarks" / "baseline.json"
+
+EMOTION_BACKENDS = ['opencv', 'ssd', 'mtcnn']
+EMOTION_ACTIONS = [['emotion'], ['emotion', 'age']]
+
+
+def synthetic_frames(count: int = 60, size=(720, 1280), seed: int = 0) -> List[np.ndarray]:
+    """Images déterministes (bruit + formes) pour comparer des configurations sans caméra"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(count):
+        frame = rng.integers(0, 60, size=size + (3,), dtype=np.uint8)
+        cx = int(size[1] * (0.3 + 0.4 * i / max(1, count - 1)))
+        cv2.ellipse(frame, (cx, size[0] // 2), (90, 120), 0, 0, 360, (140, 170, 210), -1)
+        cv2.circle(frame, (cx - 35, size[0] // 2 - 30), 12, (40, 40, 40), -1)
+        cv2.circle(frame, (cx + 35, size[0] // 2 - 30), 12, (40, 40, 40), -1)
+        cv2.ellipse(frame, (cx, size[0] // 2 + 50), (40, 15), 0, 0, 180, (60, 60, 160), 4)
+        frames.append(frame)
+    return frames
+
+
+def recorded_frames(source: Path, count: int) -> List[np.ndarray]:
+    """Premières images d'une vidéo ou d'un dossier d'images"""
+    from src.batchAnalysis import iter_frames
+    frames = []
+    for _, _, frame in iter_frames(source):
+        frames.append(frame)
+        if len(frames) >= count:
+            break
+    return frames
+
+
+def measure(func: Callable, inputs: List, warmup: int = 3) -> Dict[str, float]:
+    """
+    Appelle func sur chaque entrée et mesure la latence de chaque appel
+
+    Returns:
+        {'n', 'fps', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}
+    """
+    for item in inputs[:warmup]:
+        func(item)
+    latencies = []
+    for item in inputs:
+        start = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - start)
+    lat = np.array(latencies) * 1000
+    return {
+        'n': len(lat),
+        'fps': float(1000 * len(lat) / lat.sum()) if lat.sum() > 0 else 0.0,
+        'mean_ms': float(lat.mean()),
+        'p50_ms': float(np.percentile(lat, 50)),
+        'p95_ms': float(np.percentile(lat, 95)),
+        'p99_ms': float(np.percentile(lat, 99)),
+        'max_ms': float(lat.max()),
+    }
+
+
+def bench_emotion(frames, backends=None, action_sets=None) -> Dict[str, Dict]:
+    from src.EmotionResult import EmotionDetector
+
+    results = {}
+    for backend in backends or EMOTION_BACKENDS:
+        for actions in action_sets or EMOTION_ACTIONS:
+            name = f"emotion[{backend}|{'+'.join(actions)}]"
+            try:
+                detector = EmotionDetector(detector_backend=backend, actions=actions, preload=True)
+            except Exception as e:
+                print(f"{name} ignoré : {e}")
+                continue
+            results[name] = measure(detector.analyze, frames)
+    return results
+
+
+def bench_hands(frames) -> Dict[str, Dict]:
+    results = {}
+    for backend in ('torch', 'onnx', 'onnx-int8'):
+        name = 'hands[yolo]' if backend == 'torch' else f'hands[yolo-{backend}]'
+        try:
+            from src.IA.handDetector import HandPoseDetector as YoloHandPoseDetector
+            results[name] = measure(YoloHandPoseDetector(backend=backend).process, frames)
+        except Exception as e:
+            print(f"{name} ignoré : {e}")
+    try:
+        from gesteDetector.gestureRecognizer import HandPoseDetector as OnnxHandPoseDetector
+        results['hands[onnx]'] = measure(OnnxHandPoseDetector().process, frames)
+    except Exception as e:
+        print(f"hands[onnx] ignoré : {e}")
+    return results
+
+
+def bench_gesture(count: int = 2000, seed: int = 0) -> Dict[str, Dict]:
+    from gesteDetector.gestureRecognizer import detect_gesture, detect_gesture_batch
+
+    rng = np.random.default_rng(seed)
+    hands = rng.uniform(0, 400, size=(count, 21, 2)).astype(np.float32)
+    batches = [hands[i:i + 256] for i in range(0, count, 256)]
+    return {
+        'gesture[detect_gesture]': measure(detect_gesture, list(hands)),
+        'gesture[detect_gesture_batch x256]': measure(detect_gesture_batch, batches),
+    }
+
+
+def bench_game(fruit_counts=(10, 100, 500), iterations: int = 100) -> Dict[str, Dict]:
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from src.game.fruitType import TypeFruit
+    from src.game.game import Game
+
+    pygame.init()
+    pygame.display.set_mode((1280, 720))
+    results = {}
+    types = list(TypeFruit)
+    rng = np.random.default_rng(0)
+    try:
+        for count in fruit_counts:
+            game = Game(1280, 720)
+            game.spawn_delay = float('inf')
+            for i in range(count):
+                position = (int(rng.integers(50, 1230)), int(rng.integers(-100, 0)))
+                game.add_fruit(types[i % len(types)], position, speed=5)
+            hands = [[(600, 300, 700, 400)]] * iterations
+            results[f'game.update[{count} fruits]'] = measure(game.update, hands, warmup=0)
+    finally:
+        pygame.quit()
+    return results
+
+
+def bench_present(frames) -> Dict[str, Dict]:
+    """Conversion image caméra -> Surface : ancienne méthode contre tampon partagé"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from src.game.presenter import CameraPresenter
+
+    pygame.init()
+    height, width = frames[0].shape[:2]
+    screen = pygame.display.set_mode((width, height))
+    presenter = CameraPresenter((width, height))
+
+    def make_surface(frame):
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        screen.blit(pygame.surfarray.make_surface(rgb.swapaxes(0, 1)), (0, 0))
+
+    def shared_buffer(frame):
+        presenter.write(frame)
+        screen.blit(presenter.present(), (0, 0))
+
+    try:
+        return {
+            'present[make_surface]': measure(make_surface, frames),
+            'present[shared_buffer]': measure(shared_buffer, frames),
+        }
+    finally:
+        pygame.quit()
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Liste des cas dont le débit ou la latence p95 s'est dégradé au-delà de la tolérance"""
+    regressions = []
+    for name, current in results.items():
+        ref = baseline.get(name)
+        if ref is None:
+            continue
+        if current['p95_ms'] > ref['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {ref['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+        if current['fps'] < ref['fps'] * (1 - tolerance):
+            regressions.append(f"{name}: fps {ref['fps']:.1f} -> {current['fps']:.1f}")
+    return regressions
+
+
+def print_table(results: Dict[str, Dict]):
+    print(f"{'cas':40s} {'fps':>9s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}")
+    for name, r in results.items():
+        print(f"{name:40s} {r['fps']:9.1f} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {r['p99_ms']:9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc d'essai des détecteurs et du jeu")
+    parser.add_argument('--suite', nargs='+', choices=['emotion', 'hands', 'gesture', 'game'],
+                        default=['emotion', 'hands', 'gesture', 'game'])
+    parser.add_argument('--source', type=Path, help="Vidéo ou dossier d'images à rejouer (sinon images synthétiques)")
+    parser.add_argument('--frames', type=int, default=60, help="Nombre d'images rejouées")
+    parser.add_argument('--backends', nargs='+', default=EMOTION_BACKENDS)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Enregistre les résultats comme référence")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Dégradation tolérée (0.2 = 20 %%)")
+    args = parser.parse_args()
+
+    frames = recorded_frames(args.source, args.frames) if args.source else synthetic_frames(args.frames)
+
+    results = {}
+    if 'emotion' in args.suite:
+        results.update(bench_emotion(frames, backends=args.backends))
+    if 'hands' in args.suite:
+        results.update(bench_hands(frames))
+    if 'gesture' in args.suite:
+        results.update(bench_gesture())
+    if 'game' in args.suite:
+        results.update(bench_game())
+        results.update(bench_present(frames))
+
+    print_table(results)
+
+    if args.save_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2))
+        print(f"Référence enregistrée dans {args.baseline}")
+        return
+
+    if args.baseline.exists():
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"RÉGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+        print("Aucune régression par rapport à la référence")
+
+
+if __name__ == "__main__":
+    main()
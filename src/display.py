@@ -0,0 +1,91 @@
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+from src.instrumentation import METRICS
+
+
+class TkVideoDisplay:
+    """
+    Affichage vidéo dans un Label Tk sans allocation par image
+
+    Une seule PhotoImage, à la taille de la zone d'affichage, est mise à jour
+    sur place (paste) depuis un tampon RGBA réutilisé ; la mise à l'échelle est
+    faite une seule fois par OpenCV. Les tampons ne sont recréés que si la
+    taille de la zone ou de l'image change.
+    """
+
+    def __init__(self, label, container=None):
+        """
+        Args:
+            label: Label Tk qui affiche la vidéo
+            container: Widget dont la taille définit la zone d'affichage (label par défaut)
+        """
+        self.label = label
+        self.container = container or label
+        self.last_frame_id: Optional[int] = None
+
+        self._size: Optional[Tuple[int, int]] = None
+        self._scaled = None  # BGR à la taille d'affichage
+        self._rgba = None
+        # PIL.Image qui partage la mémoire de _rgba (Pillow ne partage pas un tampon RGB)
+        self._image = None
+        self._photo = None
+
+    def _target_size(self, frame) -> Tuple[int, int]:
+        """Taille d'affichage : l'image entière dans la zone, proportions conservées"""
+        height, width = frame.shape[:2]
+        view_w, view_h = self.container.winfo_width(), self.container.winfo_height()
+        if view_w <= 1 or view_h <= 1:
+            # zone pas encore affichée
+            return width, height
+        scale = min(view_w / width, view_h / height)
+        return max(1, int(width * scale)), max(1, int(height * scale))
+
+    def _allocate(self, size: Tuple[int, int]):
+        width, height = size
+        self._size = size
+        self._scaled = np.empty((height, width, 3), dtype=np.uint8)
+        self._rgba = np.empty((height, width, 4), dtype=np.uint8)
+        self._image = Image.frombuffer('RGBA', size, self._rgba, 'raw', 'RGBA', 0, 1)
+        self._photo = ImageTk.PhotoImage(image=self._image)
+
+    def show(self, frame, frame_id: int = None) -> bool:
+        """
+        Affiche une image BGR
+
+        Args:
+            frame: Image OpenCV (BGR)
+            frame_id: Identifiant de l'image ; rien n'est fait s'il a déjà été affiché
+
+        Returns:
+            True si l'affichage a été mis à jour
+        """
+        if frame is None or (frame_id is not None and frame_id == self.last_frame_id):
+            return False
+
+        with METRICS.timer('conversion'):
+            size = self._target_size(frame)
+            if size != self._size:
+                self._allocate(size)
+
+            if frame.shape[1::-1] == size:
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=self._rgba)
+            else:
+                cv2.resize(frame, size, dst=self._scaled, interpolation=cv2.INTER_AREA)
+                cv2.cvtColor(self._scaled, cv2.COLOR_BGR2RGBA, dst=self._rgba)
+
+            self._photo.paste(self._image)
+            # le label a pu être vidé entre-temps (arrêt de la caméra)
+            if self.label.cget('image') != str(self._photo):
+                self.label.configure(image=self._photo)
+                self.label.imgtk = self._photo
+
+        self.last_frame_id = frame_id
+        return True
+
+    def reset(self):
+        """Oublie la dernière image affichée (ex. au redémarrage de la caméra)"""
+        self.last_frame_id = None
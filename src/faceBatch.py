@@ -0,0 +1,105 @@
+import cv2
+import numpy as np
+from typing import Dict, List
+
+# Taille d'entrée des modèles d'attributs DeepFace (âge, genre, origine)
+TAILLE_ENTREE = (224, 224)
+# Taille d'entrée du modèle d'émotions (niveaux de gris)
+TAILLE_EMOTION = (48, 48)
+
+# Correspondance action DeepFace -> nom du modèle d'attribut
+MODELES_ACTIONS = {
+    'emotion': 'Emotion',
+    'age': 'Age',
+    'gender': 'Gender',
+    'race': 'Race',
+}
+
+
+def preparer_visage(face_bgr) -> np.ndarray:
+    """
+    Redimensionne un visage en 224x224 avec bandes noires (même logique que DeepFace)
+
+    Args:
+        face_bgr: Visage découpé au format BGR (uint8 ou float dans [0, 1])
+
+    Returns:
+        Tableau float32 (224, 224, 3) normalisé dans [0, 1]
+    """
+    cible_h, cible_w = TAILLE_ENTREE
+    facteur = min(cible_h / face_bgr.shape[0], cible_w / face_bgr.shape[1])
+    dsize = (int(face_bgr.shape[1] * facteur), int(face_bgr.shape[0] * facteur))
+    img = cv2.resize(np.asarray(face_bgr, dtype=np.float32), dsize)
+
+    diff_h = cible_h - img.shape[0]
+    diff_w = cible_w - img.shape[1]
+    img = np.pad(img, ((diff_h // 2, diff_h - diff_h // 2),
+                       (diff_w // 2, diff_w - diff_w // 2),
+                       (0, 0)), 'constant')
+    if img.shape[0:2] != TAILLE_ENTREE:
+        img = cv2.resize(img, (cible_w, cible_h))
+
+    if img.max() > 1:
+        img = img / 255.0
+    return img.astype(np.float32)
+
+
+def _modele_keras(action: str):
+    """Retourne le réseau Keras sous-jacent d'un modèle d'attribut DeepFace"""
+    from src.modelRegistry import REGISTRY
+    return REGISTRY.attribute_model(action)
+
+
+def _en_niveaux_de_gris(batch: np.ndarray) -> np.ndarray:
+    """Convertit un lot BGR (N, 224, 224, 3) en entrée du modèle d'émotions (N, 48, 48, 1)"""
+    gris = [cv2.resize(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), TAILLE_EMOTION) for img in batch]
+    return np.stack(gris)[..., np.newaxis]
+
+
+def predire_attributs(batch: np.ndarray, actions: List[str]) -> List[Dict]:
+    """
+    Effectue une seule passe avant par modèle sur tout le lot de visages
+
+    Args:
+        batch: Visages préparés (N, 224, 224, 3) au format BGR, float32
+        actions: Liste des analyses à effectuer ['emotion', 'age', 'gender', 'race']
+
+    Returns:
+        Liste de N dictionnaires au format de DeepFace.analyze (sans 'region')
+    """
+    from deepface.models.demography import Emotion, Gender, Race
+
+    sorties = [{} for _ in range(len(batch))]
+    if len(batch) == 0:
+        return sorties
+
+    for action in actions:
+        if action == 'emotion':
+            predictions = _modele_keras(action)(_en_niveaux_de_gris(batch), training=False).numpy()
+            for obj, pred in zip(sorties, predictions):
+                total = pred.sum()
+                obj['emotion'] = {label: float(100 * pred[i] / total)
+                                  for i, label in enumerate(Emotion.labels)}
+                obj['dominant_emotion'] = Emotion.labels[int(np.argmax(pred))]
+
+        elif action == 'age':
+            predictions = _modele_keras(action)(batch, training=False).numpy()
+            # Âge apparent = espérance de la distribution sur 0..100 ans
+            ages = predictions @ np.arange(0, predictions.shape[1])
+            for obj, age in zip(sorties, ages):
+                obj['age'] = int(age)
+
+        elif action == 'gender':
+            predictions = _modele_keras(action)(batch, training=False).numpy()
+            for obj, pred in zip(sorties, predictions):
+                obj['gender'] = {label: float(100 * pred[i]) for i, label in enumerate(Gender.labels)}
+                obj['dominant_gender'] = Gender.labels[int(np.argmax(pred))]
+
+        elif action == 'race':
+            predictions = _modele_keras(action)(batch, training=False).numpy()
+            for obj, pred in zip(sorties, predictions):
+                total = pred.sum()
+                obj['race'] = {label: float(100 * pred[i] / total) for i, label in enumerate(Race.labels)}
+                obj['dominant_race'] = Race.labels[int(np.argmax(pred))]
+
+    return sorties
@@ -0,0 +1,208 @@
+import time
+
+import cv2
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from src.EmotionResult import EmotionDetector, EmotionResult
+from src.resolution import ResolutionController, downscale, to_full_resolution
+from src.instrumentation import METRICS
+
+
+def iou(box_a, box_b) -> float:
+    """Intersection sur union de deux boîtes (x, y, w, h)"""
+    ax1, ay1, aw, ah = box_a
+    bx1, by1, bw, bh = box_b
+    ix = max(0.0, min(ax1 + aw, bx1 + bw) - max(ax1, bx1))
+    iy = max(0.0, min(ay1 + ah, by1 + bh) - max(ay1, by1))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union > 0 else 0.0
+
+
+@dataclass
+class Track:
+    """Visage suivi d'une image à l'autre"""
+    track_id: int
+    box: np.ndarray  # x, y, w, h (float)
+    confidence: float = 1.0
+
+    def region(self) -> Dict[str, int]:
+        x, y, w, h = self.box
+        return {'x': int(round(x)), 'y': int(round(y)), 'w': int(round(w)), 'h': int(round(h))}
+
+
+class FaceTracker:
+    """
+    Planificateur détection/suivi : le détecteur de visages ne tourne que toutes
+    les detect_interval images (ou quand le suivi devient incertain), les boîtes
+    sont propagées entre-temps par flux optique, et seules les zones suivies
+    sont classifiées.
+
+    Détection et suivi travaillent sur une image réduite ; la classification
+    utilise des découpes de l'image en pleine résolution. Les boîtes suivies
+    sont toujours exprimées en pleine résolution.
+    """
+
+    def __init__(self, detector: EmotionDetector, detect_interval: int = 5,
+                 min_confidence: float = 0.5, iou_threshold: float = 0.3,
+                 resolution: Optional[ResolutionController] = None):
+        """
+        Initialise le suivi
+
+        Args:
+            detector: Analyseur facial utilisé pour la détection et la classification
+            detect_interval: Nombre d'images entre deux détections complètes
+            min_confidence: Confiance de suivi en dessous de laquelle on redétecte
+            iou_threshold: IoU minimal pour associer une détection à un visage suivi
+            resolution: Contrôleur du facteur de réduction de l'image de détection
+                (None = détection en pleine résolution)
+        """
+        self.detector = detector
+        self.detect_interval = detect_interval
+        self.min_confidence = min_confidence
+        self.iou_threshold = iou_threshold
+        self.resolution = resolution
+
+        self.tracks: List[Track] = []
+        self._next_id = 0
+        self._prev_gray = None
+        self._prev_scale = None
+        self._frames_since_detection = 0
+
+    def reset(self):
+        """Oublie tous les visages suivis (la prochaine image sera détectée)"""
+        self.tracks = []
+        self._prev_gray = None
+        self._frames_since_detection = 0
+
+    def locate(self, frame) -> List[Dict[str, int]]:
+        """
+        Localise les visages (détection ou suivi) sans les classifier
+
+        Le suivi compare chaque image à la précédente : les images doivent
+        être passées dans l'ordre, par un seul thread.
+
+        Args:
+            frame: Image en pleine résolution (format numpy array BGR)
+
+        Returns:
+            Régions {'x', 'y', 'w', 'h'} des visages suivis (pleine résolution)
+        """
+        start = time.perf_counter()
+        scale = self.resolution.scale if self.resolution is not None else 1.0
+        with METRICS.timer('resize'):
+            small = downscale(frame, scale)
+            gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        tracked = False
+        if self._prev_gray is not None and self.tracks and scale == self._prev_scale \
+                and self._frames_since_detection < self.detect_interval:
+            with METRICS.timer('tracking'):
+                tracked = self._propagate(gray, scale)
+
+        if tracked:
+            self._frames_since_detection += 1
+        else:
+            with METRICS.timer('face_detection'):
+                self._detect(small, scale)
+            self._frames_since_detection = 0
+
+        self._prev_gray = gray
+        self._prev_scale = scale
+
+        if not tracked and self.resolution is not None:
+            # Le budget porte sur les images avec détection, les plus coûteuses
+            self.resolution.update(time.perf_counter() - start)
+        return [t.region() for t in self.tracks]
+
+    def classify(self, frame, regions: List[Dict[str, int]]) -> List[EmotionResult]:
+        """Classifie des visages déjà localisés (sans état : utilisable depuis plusieurs threads)"""
+        if not regions:
+            return []
+        with METRICS.timer('classification'):
+            return self.detector.classify_regions(frame, regions)
+
+    def analyze(self, frame) -> List[EmotionResult]:
+        """
+        Localise les visages (détection ou suivi) puis les classifie
+
+        Args:
+            frame: Image à analyser en pleine résolution (format numpy array BGR)
+
+        Returns:
+            Liste d'EmotionResult pour chaque visage suivi (coordonnées pleine résolution)
+        """
+        return self.classify(frame, self.locate(frame))
+
+    def _detect(self, small, scale: float):
+        """Détection complète sur l'image réduite puis association aux visages suivis par IoU"""
+        detections = [to_full_resolution(d, scale) for d in self.detector.detect_faces(small)]
+        remaining = list(self.tracks)
+        tracks = []
+
+        for det in detections:
+            box = np.array([det['x'], det['y'], det['w'], det['h']], dtype=np.float32)
+            best, best_iou = None, self.iou_threshold
+            for track in remaining:
+                score = iou(track.box, box)
+                if score >= best_iou:
+                    best, best_iou = track, score
+
+            if best is not None:
+                remaining.remove(best)
+                best.box = box
+                best.confidence = 1.0
+                tracks.append(best)
+            else:
+                tracks.append(Track(self._next_id, box))
+                self._next_id += 1
+
+        self.tracks = tracks
+
+    def _propagate(self, gray, scale: float) -> bool:
+        """
+        Déplace chaque boîte selon le flux optique médian de ses points d'intérêt
+        (calculé sur les images réduites)
+
+        Returns:
+            False si au moins un visage est perdu (il faut alors redétecter)
+        """
+        hauteur, largeur = gray.shape[:2]
+        for track in self.tracks:
+            x, y, w, h = track.box * scale
+            x1, y1 = int(max(0, x)), int(max(0, y))
+            x2, y2 = int(min(largeur, x + w)), int(min(hauteur, y + h))
+            if x2 - x1 < 8 or y2 - y1 < 8:
+                return False
+
+            mask = np.zeros_like(self._prev_gray)
+            mask[y1:y2, x1:x2] = 255
+            points = cv2.goodFeaturesToTrack(self._prev_gray, maxCorners=40, qualityLevel=0.01,
+                                             minDistance=4, mask=mask)
+            if points is None or len(points) < 4:
+                return False
+
+            nouveaux, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, points, None,
+                                                           winSize=(15, 15), maxLevel=2)
+            status = status.reshape(-1).astype(bool)
+            track.confidence = float(status.mean())
+            if track.confidence < self.min_confidence:
+                return False
+
+            avant = points.reshape(-1, 2)[status]
+            apres = nouveaux.reshape(-1, 2)[status]
+            dx, dy = np.median(apres - avant, axis=0)
+
+            # Variation d'échelle : rapport médian des distances au centre
+            dist_avant = np.linalg.norm(avant - avant.mean(axis=0), axis=1)
+            dist_apres = np.linalg.norm(apres - apres.mean(axis=0), axis=1)
+            valides = dist_avant > 1e-3
+            echelle = float(np.median(dist_apres[valides] / dist_avant[valides])) if valides.any() else 1.0
+
+            cx, cy = x + w / 2 + dx, y + h / 2 + dy
+            w, h = w * echelle, h * echelle
+            track.box = np.array([cx - w / 2, cy - h / 2, w, h], dtype=np.float32) / scale
+
+        return True
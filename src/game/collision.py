@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from .handTracking import match_boxes
+
+
+@dataclass(frozen=True)
+class HitEvent:
+    """Un fruit touché par une main"""
+    entity: int  # emplacement du fruit dans l'EntityStore
+    type_id: int
+    hand: int  # indice de la main dans les boîtes fournies
+    position: Tuple[float, float]  # centre du fruit au moment du coup
+
+
+def _as_boxes(boxes) -> np.ndarray:
+    return np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+
+def overlap_matrix(a, b) -> np.ndarray:
+    """
+    Chevauchement de chaque boîte de a avec chaque boîte de b (x1, y1, x2, y2)
+
+    Returns:
+        Tableau booléen (len(a), len(b))
+    """
+    a, b = _as_boxes(a), _as_boxes(b)
+    return ((a[:, None, 0] < b[None, :, 2]) & (a[:, None, 2] > b[None, :, 0])
+            & (a[:, None, 1] < b[None, :, 3]) & (a[:, None, 3] > b[None, :, 1]))
+
+
+def swept_overlap_matrix(boxes, starts, ends) -> np.ndarray:
+    """
+    Contact de chaque boîte fixe avec chaque boîte de main déplacée de starts à ends
+
+    Le déplacement est un segment parcouru par le centre de la main ; la boîte
+    fixe est agrandie de la demi-taille de la main (somme de Minkowski) puis le
+    segment est testé contre elle par la méthode des dalles.
+
+    Returns:
+        Tableau booléen (len(boxes), len(starts))
+    """
+    boxes, starts, ends = _as_boxes(boxes), _as_boxes(starts), _as_boxes(ends)
+    half = ((starts[:, 2:] - starts[:, :2]) + (ends[:, 2:] - ends[:, :2])) / 4  # (M, 2)
+    origin = (starts[:, :2] + starts[:, 2:]) / 2  # (M, 2)
+    delta = (ends[:, :2] + ends[:, 2:]) / 2 - origin  # (M, 2)
+
+    lo = boxes[:, None, :2] - half[None]  # (N, M, 2)
+    hi = boxes[:, None, 2:] + half[None]
+    p = origin[None]
+    d = np.broadcast_to(delta[None], lo.shape)
+
+    moving = np.abs(d) > 1e-6
+    safe_d = np.where(moving, d, 1.0)
+    t1 = (lo - p) / safe_d
+    t2 = (hi - p) / safe_d
+    t_enter = np.where(moving, np.minimum(t1, t2), -np.inf)
+    t_exit = np.where(moving, np.maximum(t1, t2), np.inf)
+    # axe immobile : le centre doit déjà être entre les bornes
+    inside = (p > lo) & (p < hi)
+    t_enter = np.where(~moving & ~inside, np.inf, t_enter)
+
+    enter = t_enter.max(axis=2)
+    leave = t_exit.min(axis=2)
+    return (enter <= leave) & (leave >= 0) & (enter <= 1)
+
+
+class CollisionEngine:
+    """
+    Collisions fruits / mains pour Game.update
+
+    Tous les fruits sont testés contre toutes les mains en une passe numpy.
+    Le déplacement d'une main entre deux détections réelles (avant-dernier et
+    dernier HandSample) est testé comme un balayage, une seule fois par
+    nouvelle détection : un geste rapide ne traverse pas un fruit sans le
+    couper, et les positions extrapolées ne sont jamais balayées.
+    """
+
+    def detect(self, indices, fruit_boxes, type_ids, hand_boxes, sweep=None) -> List[HitEvent]:
+        """
+        Args:
+            indices: Emplacements des fruits testés
+            fruit_boxes: Boîtes (N, 4) de ces fruits
+            type_ids: Type de chaque fruit
+            hand_boxes: Boîtes (M, 4) des mains à cet instant
+            sweep: (boîtes de l'avant-dernière détection, boîtes de la dernière)
+                à balayer, ou None ; les boîtes de la dernière détection sont
+                dans le même ordre que hand_boxes
+
+        Returns:
+            Un HitEvent par fruit touché (la première main qui le touche)
+        """
+        hands = _as_boxes(hand_boxes)
+        if len(indices) == 0 or len(hands) == 0:
+            return []
+
+        fruit_boxes = _as_boxes(fruit_boxes)
+        contact = overlap_matrix(fruit_boxes, hands)
+        if sweep is not None:
+            previous, latest = _as_boxes(sweep[0]), _as_boxes(sweep[1])
+            matches = match_boxes(previous, latest)
+            matched = np.flatnonzero(matches >= 0)
+            matched = matched[matched < len(hands)]
+            if len(matched):
+                contact[:, matched] |= swept_overlap_matrix(fruit_boxes, previous[matches[matched]],
+                                                            latest[matched])
+
+        hit_rows = np.flatnonzero(contact.any(axis=1))
+        hit_hands = contact[hit_rows].argmax(axis=1)
+        centers = (fruit_boxes[hit_rows, :2] + fruit_boxes[hit_rows, 2:]) / 2
+        return [HitEvent(int(indices[row]), int(type_ids[row]), int(hand), (float(cx), float(cy)))
+                for row, hand, (cx, cy) in zip(hit_rows, hit_hands, centers)]
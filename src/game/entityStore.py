@@ -0,0 +1,123 @@
+from typing import Tuple
+
+import numpy as np
+
+# États possibles d'un emplacement
+FREE = 0  # emplacement libre (réutilisable)
+WHOLE = 1  # fruit entier (un fruit coupé libère son emplacement)
+
+
+class EntityStore:
+    """
+    Entités du jeu rangées en colonnes numpy (structure de tableaux)
+
+    Chaque entité occupe un emplacement ; les emplacements libérés sont
+    réutilisés (liste libre) et les tableaux ne grandissent que si toutes les
+    places sont prises. Le déplacement et l'élimination hors écran sont
+    vectorisés sur les seules entités vivantes.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.positions = np.zeros((capacity, 2), dtype=np.float32)  # centre (x, y)
+        self.velocities = np.zeros((capacity, 2), dtype=np.float32)  # pixels par pas
+        self.sizes = np.zeros((capacity, 2), dtype=np.float32)  # largeur, hauteur
+        self.type_ids = np.zeros(capacity, dtype=np.int16)
+        self.states = np.full(capacity, FREE, dtype=np.uint8)
+
+        # pile des emplacements libres, les plus petits indices en haut
+        self._free = list(range(capacity - 1, -1, -1))
+        self._live = None  # indices vivants, recalculés après chaque changement
+
+    @property
+    def capacity(self) -> int:
+        return len(self.states)
+
+    def __len__(self) -> int:
+        return self.capacity - len(self._free)
+
+    def _grow(self):
+        old = self.capacity
+        new = old * 2
+        self.positions = np.resize(self.positions, (new, 2))
+        self.velocities = np.resize(self.velocities, (new, 2))
+        self.sizes = np.resize(self.sizes, (new, 2))
+        self.type_ids = np.resize(self.type_ids, new)
+        states = np.full(new, FREE, dtype=np.uint8)
+        states[:old] = self.states
+        self.states = states
+        self._free = list(range(new - 1, old - 1, -1)) + self._free
+
+    def spawn(self, type_id: int, position, velocity, size) -> int:
+        """Ajoute une entité et retourne son emplacement"""
+        if not self._free:
+            self._grow()
+        index = self._free.pop()
+        self.positions[index] = position
+        self.velocities[index] = velocity
+        self.sizes[index] = size
+        self.type_ids[index] = type_id
+        self.states[index] = WHOLE
+        self._live = None
+        return index
+
+    def kill(self, indices):
+        """Libère les emplacements donnés"""
+        # indices répétés : chaque emplacement n'entre qu'une fois dans la liste libre
+        indices = np.unique(np.asarray(indices, dtype=np.intp))
+        indices = indices[self.states[indices] != FREE]
+        if len(indices) == 0:
+            return
+        self.states[indices] = FREE
+        self._free.extend(sorted(indices.tolist(), reverse=True))
+        self._live = None
+
+    def clear(self):
+        self.kill(self.live())
+
+    def live(self) -> np.ndarray:
+        """Indices des entités vivantes"""
+        if self._live is None:
+            self._live = np.flatnonzero(self.states != FREE)
+        return self._live
+
+    def with_state(self, state: int) -> np.ndarray:
+        live = self.live()
+        return live[self.states[live] == state]
+
+    def step(self, dt: float = 1.0):
+        """Déplace toutes les entités vivantes"""
+        live = self.live()
+        self.positions[live] += self.velocities[live] * dt
+
+    def boxes(self, indices=None) -> np.ndarray:
+        """
+        Returns:
+            Tableau (N, 4) des boîtes (x1, y1, x2, y2) des entités indiquées (vivantes par défaut)
+        """
+        indices = self.live() if indices is None else indices
+        half = self.sizes[indices] / 2
+        centers = self.positions[indices]
+        return np.hstack([centers - half, centers + half])
+
+    def cull(self, bounds: Tuple[int, int], margin: float = 0.0) -> np.ndarray:
+        """
+        Libère les entités entièrement sorties de l'écran
+
+        Args:
+            bounds: (largeur, hauteur) de l'écran
+            margin: Marge au-delà des bords avant suppression
+
+        Returns:
+            Indices des entités supprimées
+        """
+        live = self.live()
+        if len(live) == 0:
+            return live
+        width, height = bounds
+        x1, y1, x2, y2 = self.boxes(live).T
+        outside = (y1 > height + margin) | (x2 < -margin) | (x1 > width + margin)
+        # seules les entités qui remontent (vitesse < 0) peuvent sortir par le haut
+        outside |= (y2 < -margin) & (self.velocities[live, 1] < 0)
+        gone = live[outside]
+        self.kill(gone)
+        return gone
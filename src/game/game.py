@@ -1,40 +1,94 @@
-import cv2
 import pygame
 import random
-from .fruit import Fruit
+import time
+
+from .collision import CollisionEngine
+from .entityStore import WHOLE, EntityStore
 from src.IA.handDetector import HandPoseDetector
 from .fruitType import TypeFruit
+from .handTracking import FpsCounter, HandDetectionWorker
+from .presenter import CameraPresenter
+from .spriteCache import SPRITES
+from src.instrumentation import METRICS
+import src.EmotionResult as ER
 
 
 class Game:
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.fruits = []
+        # Fruits rangés en tableaux numpy (position, vitesse, type, état)
+        self.entities = EntityStore()
         self.last_spawn = pygame.time.get_ticks()
         self.spawn_delay = 2000
+        # Collisions mains / fruits, et coups accumulés jusqu'à pop_hits()
+        self.collisions = CollisionEngine()
+        self.hits = []
+
+        # Toutes les images sont prêtes avant la première apparition d'un fruit
+        SPRITES.preload()
+        self.fruit_types = list(TypeFruit)
+        # sprites[type_id] : image du fruit entier
+        self.sprites = [SPRITES.get(t.value) for t in self.fruit_types]
+
+    def add_fruit(self, fruit_type: TypeFruit, position, speed=5):
+        type_id = self.fruit_types.index(fruit_type)
+        size = self.sprites[type_id].get_size()
+        return self.entities.spawn(type_id, position, (0, speed), size)
 
     def spawn_fruit(self):
         current_time = pygame.time.get_ticks()
         if current_time - self.last_spawn >= self.spawn_delay:
-            fruit_type = random.choice(list(TypeFruit))
+            fruit_type = random.choice(self.fruit_types)
             x_pos = random.randint(50, self.screen_width - 50)
             y_pos = 0
-            self.fruits.append(Fruit(fruitType=fruit_type, position=(x_pos, y_pos), speed=5))
+            self.add_fruit(fruit_type, (x_pos, y_pos), speed=5)
             self.last_spawn = current_time
 
-    def update(self,hand_box):
+    def update(self, hand_box, sweep=None):
+        """
+        Avance le jeu d'un pas
+
+        Args:
+            hand_box: Boîtes des mains à l'instant de ce pas
+            sweep: (avant-dernière, dernière) boîtes détectées à balayer, ou None
+
+        Returns:
+            Les HitEvent de ce pas (fruits coupés)
+        """
         self.spawn_fruit()
-        for fruit in self.fruits:
-            fruit.move()
-            if(fruit.collides_with_hand(hand_box)):
-                self.fruits.remove(fruit)
-                fruit.cut()
+        self.entities.step()
+        # fruits sortis par le bas : emplacements libérés
+        self.entities.cull((self.screen_width, self.screen_height))
+
+        whole = self.entities.with_state(WHOLE)
+        hits = self.collisions.detect(whole, self.entities.boxes(whole), self.entities.type_ids[whole],
+                                      hand_box, sweep)
+        if hits:
+            # comme avant le stockage en tableaux : un fruit coupé disparaît
+            self.entities.kill([hit.entity for hit in hits])
+            self.hits.extend(hits)
+        return hits
+
+    def pop_hits(self):
+        """Coups enregistrés depuis le dernier appel"""
+        hits, self.hits = self.hits, []
+        return hits
 
     def draw(self, screen, camera_surface):
         screen.blit(camera_surface, (0, 0))
-        for fruit in self.fruits:
-            fruit.draw(screen)
+        entities = self.entities
+        live = entities.live()
+        if len(live) == 0:
+            return
+        corners = (entities.positions[live] - entities.sizes[live] / 2).astype(int).tolist()
+        screen.blits([(self.sprites[type_id], corner)
+                      for type_id, corner in zip(entities.type_ids[live].tolist(), corners)],
+                     doreturn=False)
+
+# Pas fixe de la simulation (60 Hz), indépendant du rythme d'affichage et du détecteur
+TICK = 1 / 60
+
 
 def create_fruit_ninja_game():
     pygame.init()
@@ -43,13 +97,28 @@ def create_fruit_ninja_game():
     pygame.display.set_caption("Fruit Ninja Camera")
     clock = pygame.time.Clock()
 
-    cap = cv2.VideoCapture(0)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, WIDTH)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, HEIGHT)
+    # Capture et détection dans leurs propres threads : le jeu n'attend jamais YOLO
+    camera = ER.VideoCapture(0, threaded=True, frame_size=(WIDTH, HEIGHT))
+    if not camera.start():
+        pygame.quit()
+        return
 
     detector = HandPoseDetector()
+    # la caméra peut ignorer la résolution demandée : mains et collisions en pixels de la fenêtre
+    detection = HandDetectionWorker(camera, detector, display_size=(WIDTH, HEIGHT)).start()
 
     game = Game(WIDTH, HEIGHT)
+    # Une seule Surface caméra pour toute la partie
+    presenter = CameraPresenter((WIDTH, HEIGHT))
+    game_fps = FpsCounter()
+    camera_surface = None
+    frame_id = -1
+    last_caption = 0.0
+    score = 0
+
+    accumulator = 0.0
+    previous = time.perf_counter()
+    swept_id = -1  # dernière détection déjà balayée
 
     running = True
     while running:
@@ -57,27 +126,43 @@ def create_fruit_ninja_game():
             if event.type == pygame.QUIT:
                 running = False
 
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-
-        # Détection YOLO
-        detector.process(frame)
-        hands_box = detector.get_hands_box()
-
-        # Dessin OpenCV
-        frame = detector.draw(frame)
-
-        # Conversion OpenCV → Pygame
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame = frame.swapaxes(0, 1)
-        camera_surface = pygame.surfarray.make_surface(frame)
-
-        game.update(hands_box)
-        game.draw(screen, camera_surface)
-
-        for (x1, y1, x2, y2) in hands_box:
+        now = time.perf_counter()
+        # borne l'écart après une pause (déplacement de fenêtre...) pour ne pas rattraper des secondes
+        accumulator += min(now - previous, 0.25)
+        previous = now
+
+        with METRICS.timer('game.update'):
+            previous_sample, sample = detection.samples()
+            # instant simulé du pas : l'horloge du jeu est en retard de accumulator sur now
+            tick_time = now - accumulator
+            while accumulator >= TICK:
+                tick_time += TICK
+                # déplacement réel entre les deux dernières détections, balayé une seule fois
+                sweep = None
+                if previous_sample is not None and sample.frame_id != swept_id:
+                    sweep = (previous_sample.boxes, sample.boxes)
+                    swept_id = sample.frame_id
+                # mains estimées à l'instant de chaque pas (interpolées entre deux détections)
+                game.update(detection.hands_at(tick_time), sweep)
+                accumulator -= TICK
+        score += len(game.pop_hits())
+
+        latest = camera.read_latest(after_id=frame_id)
+        if latest is not None:
+            frame_id, _, frame = latest
+            with METRICS.timer('game.present'):
+                # Copie dans le tampon de la Surface d'affichage, puis dessin OpenCV
+                # du dernier résultat publié par le thread de détection
+                _, sample = detection.samples()
+                buffer = presenter.write(frame)
+                if sample is not None:
+                    detector.draw(buffer, sample.result)
+                camera_surface = presenter.present()
+
+        if camera_surface is not None:
+            game.draw(screen, camera_surface)
+
+        for (x1, y1, x2, y2) in detection.hands_at(now).astype(int).tolist():
             pygame.draw.rect(
                 screen,
                 (0, 255, 0),
@@ -86,9 +171,22 @@ def create_fruit_ninja_game():
             )
 
         pygame.display.flip()
+        game_fps.tick()
+        if now - last_caption >= 1.0:
+            if detection.error is not None:
+                pygame.display.set_caption("Fruit Ninja Camera - détection des mains indisponible "
+                                           "(modèle manquant, voir la console)")
+            else:
+                pygame.display.set_caption(f"Fruit Ninja Camera - score {score} - jeu {game_fps.fps:.0f} fps"
+                                           f" | détection {detection.detection_fps:.0f} fps")
+            last_caption = now
         clock.tick(60)
 
-    cap.release()
+    detection.stop()
+    camera.release()
+    SPRITES.clear()
     pygame.quit()
+
+
 if __name__ == "__main__":
-    create_fruit_ninja_game()
\ No newline at end of file
+    create_fruit_ninja_game()
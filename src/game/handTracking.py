@@ -0,0 +1,196 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.instrumentation import METRICS
+from src.modelStore import ModelIntegrityError
+
+
+class FpsCounter:
+    """Débit moyen (moyenne glissante exponentielle des intervalles)"""
+
+    def __init__(self, smoothing: float = 0.1):
+        self.smoothing = smoothing
+        self.fps = 0.0
+        self._last = None
+
+    def tick(self, now: float = None):
+        now = time.perf_counter() if now is None else now
+        if self._last is not None and now > self._last:
+            fps = 1.0 / (now - self._last)
+            self.fps = fps if not self.fps else (1 - self.smoothing) * self.fps + self.smoothing * fps
+        self._last = now
+
+
+@dataclass(frozen=True)
+class HandSample:
+    """Boîtes des mains détectées sur une image"""
+    frame_id: int
+    timestamp: float  # instant de capture de l'image (time.perf_counter)
+    boxes: np.ndarray  # (N, 4) x1, y1, x2, y2
+    result: object = None  # résultat complet du détecteur (HandPoseResult pour YOLO)
+
+
+def match_boxes(previous: np.ndarray, current: np.ndarray, max_distance: float = 2.0) -> np.ndarray:
+    """
+    Associe chaque main courante à la main précédente la plus proche (centres)
+
+    Args:
+        max_distance: Écart maximal entre les centres, en multiple de la
+            diagonale de la plus grande des deux boîtes ; au-delà, la main
+            courante est une nouvelle main (pas de déplacement à travers l'écran)
+
+    Returns:
+        Pour chaque ligne de current, l'indice dans previous ou -1
+    """
+    matches = np.full(len(current), -1)
+    if len(previous) == 0 or len(current) == 0:
+        return matches
+    c_prev = (previous[:, :2] + previous[:, 2:]) / 2
+    c_cur = (current[:, :2] + current[:, 2:]) / 2
+    dist = np.linalg.norm(c_cur[:, None] - c_prev[None], axis=2)
+    diag_prev = np.linalg.norm(previous[:, 2:] - previous[:, :2], axis=1)
+    diag_cur = np.linalg.norm(current[:, 2:] - current[:, :2], axis=1)
+    allowed = dist <= max_distance * np.maximum(diag_cur[:, None], diag_prev[None])
+    # appariement glouton, distances croissantes, parmi les paires assez proches
+    used_cur, used_prev = set(), set()
+    for flat in np.argsort(dist, axis=None):
+        i, j = divmod(int(flat), len(previous))
+        if i in used_cur or j in used_prev or not allowed[i, j]:
+            continue
+        matches[i] = j
+        used_cur.add(i)
+        used_prev.add(j)
+    return matches
+
+
+class HandDetectionWorker:
+    """
+    Détection des mains dans un thread séparé
+
+    Le thread lit la dernière image de la caméra, lance le détecteur et publie
+    des HandSample horodatés ; la boucle du jeu n'attend jamais le détecteur
+    et estime la position des mains à l'instant voulu avec hands_at().
+    """
+
+    def __init__(self, camera, detector, max_extrapolation: float = 0.1, stale_after: float = 0.5,
+                 display_size: Tuple[int, int] = None):
+        """
+        Args:
+            camera: VideoCapture en mode threaded (src.EmotionResult)
+            detector: Détecteur de mains (process(frame), puis boîtes du résultat ou get_hands_box())
+            max_extrapolation: Durée max (s) de prolongation du mouvement après la dernière détection
+            stale_after: Au-delà de cette durée (s) sans détection, plus aucune main n'est renvoyée
+            display_size: Taille (largeur, hauteur) de l'affichage ; les boîtes publiées sont
+                mises à cette échelle si la caméra fournit une autre résolution
+        """
+        self.camera = camera
+        self.detector = detector
+        self.display_size = display_size
+        self.max_extrapolation = max_extrapolation
+        self.stale_after = stale_after
+
+        self._lock = threading.Lock()
+        self._previous: Optional[HandSample] = None
+        self._latest: Optional[HandSample] = None
+        self._thread = None
+        self._running = False
+        self._fps = FpsCounter()
+        self.error: Optional[Exception] = None  # erreur qui a arrêté la détection
+
+    @property
+    def detection_fps(self) -> float:
+        return self._fps.fps
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="hand-detection", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _loop(self):
+        last_id = -1
+        while self._running:
+            latest = self.camera.read_latest(after_id=last_id)
+            if latest is None:
+                time.sleep(0.002)
+                continue
+            frame_id, timestamp, frame = latest
+            last_id = frame_id
+            try:
+                with METRICS.timer('game.detection'):
+                    result = self.detector.process(frame)
+                    # les détecteurs à résultat structuré fournissent déjà les boîtes
+                    boxes = getattr(result, 'boxes', None)
+                    if boxes is None:
+                        boxes = self.detector.get_hands_box()
+                    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+                    result, boxes = self._to_display(frame, result, boxes)
+            except (ModelIntegrityError, FileNotFoundError) as e:
+                # modèle absent ou non vérifié : inutile de réessayer à chaque image
+                print(f"Détection des mains arrêtée : {e}")
+                self.error = e
+                break
+            except Exception as e:
+                print(f"Erreur lors de la détection des mains : {e}")
+                continue
+            self.publish(HandSample(frame_id, timestamp, boxes, result))
+
+    def _to_display(self, frame, result, boxes):
+        """Passe résultat et boîtes des pixels caméra aux pixels de l'affichage"""
+        height, width = frame.shape[:2]
+        if self.display_size is None or (width, height) == tuple(self.display_size):
+            return result, boxes
+        sx, sy = self.display_size[0] / width, self.display_size[1] / height
+        if hasattr(result, 'scaled'):
+            result = result.scaled(sx, sy)
+        return result, boxes * np.array([sx, sy, sx, sy], dtype=np.float32)
+
+    def publish(self, sample: HandSample):
+        with self._lock:
+            self._previous, self._latest = self._latest, sample
+        self._fps.tick()
+
+    def samples(self) -> Tuple[Optional[HandSample], Optional[HandSample]]:
+        """(avant-dernière, dernière) détections publiées"""
+        with self._lock:
+            return self._previous, self._latest
+
+    def hands_at(self, t: float = None) -> np.ndarray:
+        """
+        Position estimée des mains à l'instant t (time.perf_counter)
+
+        Interpolation linéaire entre les deux dernières détections, prolongée
+        au-delà de la dernière (au plus max_extrapolation) pour compenser la
+        latence du détecteur.
+
+        Returns:
+            Tableau (N, 4) de boîtes x1, y1, x2, y2
+        """
+        t = time.perf_counter() if t is None else t
+        previous, latest = self.samples()
+        if latest is None or t - latest.timestamp > self.stale_after:
+            return np.empty((0, 4), dtype=np.float32)
+        if previous is None or latest.timestamp <= previous.timestamp:
+            return latest.boxes
+
+        dt = latest.timestamp - previous.timestamp
+        # t - latest.timestamp est négatif pour une interpolation
+        ahead = min(t - latest.timestamp, self.max_extrapolation)
+        ahead = max(ahead, -dt)
+
+        boxes = latest.boxes.copy()
+        matches = match_boxes(previous.boxes, latest.boxes)
+        matched = matches >= 0
+        velocity = (latest.boxes[matched] - previous.boxes[matches[matched]]) / dt
+        boxes[matched] += velocity * ahead
+        return boxes
@@ -0,0 +1,50 @@
+from typing import Tuple
+
+import cv2
+import numpy as np
+import pygame
+
+
+class CameraPresenter:
+    """
+    Affichage des images caméra dans une Surface pygame unique
+
+    La Surface partage la mémoire d'un tableau numpy alloué une seule fois :
+    chaque image y est copiée (ou redimensionnée) directement, sans créer de
+    nouveau tableau ni de nouvelle Surface.
+    """
+
+    def __init__(self, size: Tuple[int, int]):
+        """
+        Args:
+            size: Taille (largeur, hauteur) de l'image affichée
+        """
+        self.size = tuple(size)
+        width, height = self.size
+        self.buffer = np.zeros((height, width, 3), dtype=np.uint8)  # BGR, comme OpenCV
+        try:
+            # pygame >= 2.1.3 lit directement du BGR
+            self.surface = pygame.image.frombuffer(self.buffer, self.size, 'BGR')
+            self._rgb = None
+        except ValueError:
+            self._rgb = np.zeros_like(self.buffer)
+            self.surface = pygame.image.frombuffer(self._rgb, self.size, 'RGB')
+
+    def write(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Copie l'image BGR dans le tampon d'affichage
+
+        Returns:
+            Le tampon, sur lequel on peut dessiner avec OpenCV avant present()
+        """
+        if frame.shape[1::-1] == self.size:
+            np.copyto(self.buffer, frame)
+        else:
+            cv2.resize(frame, self.size, dst=self.buffer)
+        return self.buffer
+
+    def present(self) -> pygame.Surface:
+        """Surface à jour (toujours la même instance)"""
+        if self._rgb is not None:
+            cv2.cvtColor(self.buffer, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return self.surface
@@ -0,0 +1,124 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import pygame
+
+# Chemin absolu vers src/assets/fruits/
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets" / "fruits"
+
+# Échelle utilisée par le jeu (les images d'origine font ~600 px)
+DEFAULT_SCALE = 0.5
+
+
+@dataclass
+class TextureAtlas:
+    """Une seule surface contenant plusieurs sprites, et la position de chacun"""
+    surface: pygame.Surface
+    rects: Dict[Tuple[str, Tuple[int, int]], pygame.Rect] = field(default_factory=dict)
+
+
+class SpriteCache:
+    """
+    Cache partagé des images du jeu
+
+    Chaque PNG est lu une seule fois, puis chaque taille demandée est
+    redimensionnée une seule fois : créer un fruit ne coûte ni lecture disque
+    ni rééchantillonnage.
+    """
+
+    def __init__(self, assets_dir: Path = ASSETS_DIR):
+        self.assets_dir = Path(assets_dir)
+        self._raw: Dict[str, pygame.Surface] = {}
+        self._scaled: Dict[Tuple[str, Tuple[int, int]], pygame.Surface] = {}
+        self.atlas = None
+
+    def names(self) -> List[str]:
+        """Nom (sans extension) de chaque image du dossier : apple, apple_half_1, bomb, splash_red..."""
+        return sorted(p.stem for p in self.assets_dir.glob("*.png"))
+
+    def raw(self, name: str) -> pygame.Surface:
+        """Image d'origine, lue une seule fois"""
+        surface = self._raw.get(name)
+        if surface is None:
+            surface = pygame.image.load(str(self.assets_dir / f"{name}.png"))
+            # convert_alpha n'est possible qu'une fois la fenêtre créée
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self._raw[name] = surface
+        return surface
+
+    def size_for(self, name: str, scale: float = DEFAULT_SCALE) -> Tuple[int, int]:
+        width, height = self.raw(name).get_size()
+        return max(1, int(width * scale)), max(1, int(height * scale))
+
+    def get(self, name: str, scale: float = DEFAULT_SCALE, size: Tuple[int, int] = None) -> pygame.Surface:
+        """
+        Retourne l'image name redimensionnée (partagée : ne pas dessiner dessus)
+
+        Args:
+            name: Nom de l'image, ex. 'apple' ou 'apple_half_1'
+            scale: Facteur d'échelle par rapport à l'image d'origine
+            size: Taille exacte (largeur, hauteur), prioritaire sur scale
+        """
+        size = tuple(size) if size is not None else self.size_for(name, scale)
+        key = (name, size)
+        surface = self._scaled.get(key)
+        if surface is None:
+            if self.atlas is not None and key in self.atlas.rects:
+                surface = self.atlas.surface.subsurface(self.atlas.rects[key])
+            else:
+                raw = self.raw(name)
+                surface = raw if raw.get_size() == size else pygame.transform.smoothscale(raw, size)
+            self._scaled[key] = surface
+        return surface
+
+    def preload(self, names: Iterable[str] = None, scale: float = DEFAULT_SCALE):
+        """Charge et redimensionne à l'avance (à appeler après pygame.display.set_mode)"""
+        for name in names or self.names():
+            self.get(name, scale)
+
+    def build_atlas(self, names: Iterable[str] = None, scale: float = DEFAULT_SCALE,
+                    max_width: int = 2048) -> TextureAtlas:
+        """
+        Regroupe les sprites dans une seule surface (rangement par étagères)
+
+        Les appels suivants à get() pour ces tailles renvoient des
+        sous-surfaces de l'atlas.
+        """
+        sprites = [(name, self.get(name, scale)) for name in names or self.names()]
+        # les plus hauts d'abord : étagères mieux remplies
+        sprites.sort(key=lambda item: item[1].get_height(), reverse=True)
+
+        rects = {}
+        x = y = shelf_height = width = 0
+        for name, surface in sprites:
+            w, h = surface.get_size()
+            if x + w > max_width and x > 0:
+                x, y = 0, y + shelf_height
+                shelf_height = 0
+            rects[(name, (w, h))] = pygame.Rect(x, y, w, h)
+            x += w
+            shelf_height = max(shelf_height, h)
+            width = max(width, x)
+
+        atlas_surface = pygame.Surface((max(1, width), max(1, y + shelf_height)), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            atlas_surface = atlas_surface.convert_alpha()
+        for name, surface in sprites:
+            atlas_surface.blit(surface, rects[(name, surface.get_size())])
+
+        self.atlas = TextureAtlas(atlas_surface, rects)
+        for key, rect in rects.items():
+            self._scaled[key] = atlas_surface.subsurface(rect)
+        return self.atlas
+
+    def clear(self):
+        """Oublie toutes les surfaces (ex. après pygame.quit)"""
+        self._raw.clear()
+        self._scaled.clear()
+        self.atlas = None
+
+
+# Cache partagé par tout le jeu
+SPRITES = SpriteCache()
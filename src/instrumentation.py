@@ -0,0 +1,171 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+# Bornes supérieures (secondes) des seaux d'histogramme
+BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+
+class Histogram:
+    """Histogramme de durées à seaux fixes + fenêtre des dernières mesures pour les percentiles"""
+
+    def __init__(self, recent: int = 512):
+        self.buckets = [0] * (len(BUCKETS) + 1)  # dernier seau : +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.recent = deque(maxlen=recent)
+
+    def observe(self, seconds: float):
+        i = 0
+        while i < len(BUCKETS) and seconds > BUCKETS[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+        self.recent.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        recent = np.fromiter(self.recent, dtype=np.float64) if self.recent else np.zeros(1)
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'last': self.last,
+            'p50': float(np.percentile(recent, 50)),
+            'p95': float(np.percentile(recent, 95)),
+            'p99': float(np.percentile(recent, 99)),
+            'max': self.max,
+        }
+
+
+class Metrics:
+    """Registre de durées par étape (capture, détection, affichage...)"""
+
+    def __init__(self):
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._dump_thread = None
+        self._dump_stop = threading.Event()
+
+    def observe(self, name: str, seconds: float):
+        """Enregistre une durée (en secondes) pour l'étape name"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+        collected = getattr(self._local, 'collected', None)
+        if collected is not None:
+            collected.append((name, seconds))
+
+    @contextmanager
+    def collect(self):
+        """
+        Relève aussi les mesures faites par ce thread dans le bloc, pour les
+        transmettre à un autre processus : with METRICS.collect() as timings: ...
+
+        Yields:
+            Liste de (étape, durée en secondes), remplie pendant le bloc
+        """
+        previous = getattr(self._local, 'collected', None)
+        self._local.collected = timings = []
+        try:
+            yield timings
+        finally:
+            self._local.collected = previous
+
+    @contextmanager
+    def timer(self, name: str):
+        """Chronomètre le bloc : with METRICS.timer('classification'): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns:
+            {étape: {'count', 'mean', 'last', 'p50', 'p95', 'p99', 'max'}} (secondes)
+        """
+        with self._lock:
+            return {name: h.summary() for name, h in sorted(self._histograms.items())}
+
+    def to_json(self) -> str:
+        return json.dumps({'timestamp': time.time(), 'stages': self.snapshot()}, indent=2)
+
+    def to_prometheus(self, metric: str = 'emotion_stage_duration_seconds') -> str:
+        """Export au format texte Prometheus (un histogramme étiqueté par étape)"""
+        lines = [f"# HELP {metric} Durée des étapes de traitement",
+                 f"# TYPE {metric} histogram"]
+        with self._lock:
+            for name, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(list(BUCKETS) + ['+Inf'], h.buckets):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{stage="{name}"}} {h.total}')
+                lines.append(f'{metric}_count{{stage="{name}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def start_dump(self, path: str, interval: float = 10.0, fmt: str = 'json'):
+        """
+        Écrit périodiquement les mesures dans un fichier
+
+        Args:
+            path: Fichier de sortie (réécrit à chaque fois)
+            interval: Période d'écriture en secondes
+            fmt: 'json' ou 'prometheus'
+        """
+        self.stop_dump()
+        self._dump_stop.clear()
+
+        def loop():
+            while not self._dump_stop.wait(interval):
+                self.dump(path, fmt)
+
+        self._dump_thread = threading.Thread(target=loop, daemon=True)
+        self._dump_thread.start()
+
+    def dump(self, path: str, fmt: str = 'json'):
+        content = self.to_prometheus() if fmt == 'prometheus' else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def stop_dump(self):
+        if self._dump_thread is not None:
+            self._dump_stop.set()
+            self._dump_thread.join(timeout=1.0)
+            self._dump_thread = None
+
+    def draw_overlay(self, frame, stages: List[str] = None, origin=(10, 20)):
+        """Affiche la latence moyenne et p95 de chaque étape en haut de l'image"""
+        snapshot = self.snapshot()
+        x, y = origin
+        for name in stages or snapshot.keys():
+            if name not in snapshot:
+                continue
+            s = snapshot[name]
+            text = f"{name}: {s['mean'] * 1000:.1f} ms (p95 {s['p95'] * 1000:.1f})"
+            cv2.putText(frame, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 0, 0), 3)
+            cv2.putText(frame, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 0), 1)
+            y += 18
+        return frame
+
+
+# Registre partagé par tout le processus
+METRICS = Metrics()
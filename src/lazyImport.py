@@ -0,0 +1,144 @@
+"""
+Imports différés et mesure du temps d'import.
+
+Exemple :
+    python -m src.lazyImport src.mainWindow     # modules les plus lents à importer
+"""
+import argparse
+import importlib
+import subprocess
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Callable, Dict, List, Tuple
+
+# Durée (secondes) de chaque import effectué via ce module
+IMPORT_TIMES: Dict[str, float] = {}
+_lock = threading.RLock()
+
+
+def import_timed(name: str) -> ModuleType:
+    """Importe le module name et enregistre la durée de l'import"""
+    with _lock:
+        if name in sys.modules:
+            return sys.modules[name]
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        IMPORT_TIMES[name] = time.perf_counter() - start
+        return module
+
+
+class LazyModule:
+    """Module importé seulement au premier accès à l'un de ses attributs"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self) -> ModuleType:
+        if self._module is None:
+            self._module = import_timed(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "chargé" if self.loaded else "différé"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Ex. : DeepFace = lazy_import('deepface.DeepFace')"""
+    return LazyModule(name)
+
+
+class BackgroundLoader:
+    """
+    Exécute des étapes de chargement (imports, préchauffage...) dans un thread
+
+    La progression est déposée dans une liste lue par le thread de
+    l'interface (Tk n'accepte pas les appels depuis un autre thread).
+    """
+
+    def __init__(self, steps: List[Tuple[str, Callable[[], object]]]):
+        """
+        Args:
+            steps: Liste de (libellé, fonction) exécutées dans l'ordre
+        """
+        self.steps = steps
+        self.done = threading.Event()
+        self.errors: List[Tuple[str, Exception]] = []
+        self.completed: List[str] = []  # libellés des étapes terminées sans erreur
+        self._messages: List[str] = []
+        self._messages_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="background-loader", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        total = len(self.steps)
+        for i, (label, step) in enumerate(self.steps, start=1):
+            self._post(f"{label}... ({i}/{total})")
+            try:
+                step()
+            except Exception as e:
+                print(f"Erreur lors du chargement ({label}) : {e}")
+                self.errors.append((label, e))
+            else:
+                self.completed.append(label)
+        self._post("Prêt" if not self.errors else f"Prêt ({len(self.errors)} erreur(s))")
+        self.done.set()
+
+    def _post(self, message: str):
+        with self._messages_lock:
+            self._messages.append(message)
+
+    def poll(self) -> List[str]:
+        """Messages de progression depuis le dernier appel"""
+        with self._messages_lock:
+            messages, self._messages = self._messages, []
+        return messages
+
+
+def measure_import_time(module: str, top: int = 15) -> List[Tuple[str, float]]:
+    """
+    Importe module dans un nouvel interpréteur (python -X importtime)
+
+    Returns:
+        [(module, durée cumulée en secondes), ...] des plus lents, le premier étant module
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return sorted(times.items(), key=lambda kv: kv[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps d'import d'un module")
+    parser.add_argument('module', nargs='?', default='src.mainWindow')
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    for name, seconds in measure_import_time(args.module, args.top):
+        print(f"{seconds * 1000:9.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+from src.EmotionStatistics import EmotionStatistics
+
+
+class LiveEmotionChart:
+    """
+    Graphique d'évolution des émotions intégré au panneau Tk
+
+    Une seule figure Agg est créée ; à chaque rafraîchissement (limité à
+    refresh_hz) seuls les éléments qui changent sont redessinés par blitting.
+    Le thread d'analyse ne fait qu'alimenter EmotionStatistics, tout le dessin
+    a lieu dans la boucle Tk.
+    """
+
+    def __init__(self, master, stats: EmotionStatistics, refresh_hz: float = 2.0):
+        """
+        Args:
+            master: Widget Tk parent
+            stats: Statistiques à afficher
+            refresh_hz: Fréquence maximale de rafraîchissement
+        """
+        self.master = master
+        self.stats = stats
+        self.interval_ms = int(1000 / refresh_hz)
+
+        self.figure = Figure(figsize=(4, 2.6), dpi=80)
+        self.ax = self.figure.add_subplot()
+        EmotionStatistics.preparer_axes_evolution(self.ax)
+        self.ax.set_xlim(0, 10)
+        self.figure.tight_layout()
+
+        # Éléments dynamiques : exclus du dessin normal, redessinés par blitting
+        self.line_moyenne, = self.ax.plot([], [], color='#2c3e50', linewidth=2, animated=True)
+        self.line_min, = self.ax.plot([], [], color='#2c3e50', linewidth=0.5, alpha=0.4,
+                                      drawstyle='steps-post', animated=True)
+        self.line_max, = self.ax.plot([], [], color='#2c3e50', linewidth=0.5, alpha=0.4,
+                                      drawstyle='steps-post', animated=True)
+        self.texte = self.ax.text(0.02, 0.95, "", transform=self.ax.transAxes, fontsize=8,
+                                  va='top', animated=True,
+                                  bbox={"facecolor": "orange", "alpha": 0.2})
+        self._artists = [self.line_min, self.line_max, self.line_moyenne, self.texte]
+
+        # Figure réutilisée pour l'export du camembert
+        self.figure_camembert = Figure(figsize=(8, 8))
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self._background = None
+        self._version = -1
+        self._job = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        """Mémorise le fond (axes, grille) après chaque dessin complet"""
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self._artists:
+            self.ax.draw_artist(artist)
+
+    def start(self):
+        """Lance les rafraîchissements périodiques"""
+        if self._job is None:
+            self._tick()
+
+    def stop(self):
+        if self._job is not None:
+            self.master.after_cancel(self._job)
+            self._job = None
+
+    def _tick(self):
+        if self.stats.version != self._version:
+            self.refresh()
+        self._job = self.master.after(self.interval_ms, self._tick)
+
+    def refresh(self):
+        """Met à jour les données des éléments dynamiques puis les redessine"""
+        donnees = self.stats.instantane()
+        self._version = donnees['version']
+        indices, minimums, maximums, moyennes = donnees['historique']
+
+        self.line_moyenne.set_data(indices, moyennes)
+        visible = donnees['regroupe']
+        self.line_min.set_data(indices, minimums)
+        self.line_max.set_data(indices, maximums)
+        self.line_min.set_visible(visible)
+        self.line_max.set_visible(visible)
+        texte = f"Total : {donnees['total']}"
+        if donnees['age_moyen'] is not None:
+            texte += f" | Âge moyen : {donnees['age_moyen']:.1f}"
+        if len(donnees['ages_recents']):
+            # moyennes sur les dernières analyses seulement (retention)
+            texte += (f"\nRécent : âge {donnees['ages_recents'].mean():.1f}"
+                      f" | humeur {donnees['scores_recents'].mean():+.1f}")
+        self.texte.set_text(texte)
+
+        total = donnees['total']
+        if total > self.ax.get_xlim()[1]:
+            # Changement d'échelle : un dessin complet est nécessaire (déclenche _on_draw)
+            self.ax.set_xlim(0, max(10, int(total * 1.5)))
+            self.canvas.draw_idle()
+            return
+
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.ax.bbox)
+
+    def export(self, chemin_evolution='datas/evolution_emotions.png',
+               chemin_camembert='datas/repartition_emotions_camembert.png'):
+        """Enregistre les PNG à partir des mêmes objets Figure que l'affichage"""
+        if not self.stats.total_stats:
+            print("Aucune donnée disponible pour générer le graphique.")
+            return
+        self.refresh()
+        for artist in self._artists:
+            artist.set_animated(False)
+        try:
+            self.figure.savefig(chemin_evolution, dpi=150)
+        finally:
+            for artist in self._artists:
+                artist.set_animated(True)
+            self.canvas.draw_idle()
+        self.stats.dessiner_camembert(self.figure_camembert)
+        self.figure_camembert.savefig(chemin_camembert)
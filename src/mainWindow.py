@@ -1,23 +1,32 @@
-import pygame
+import time
+# Début du démarrage, pour mesurer le délai avant l'affichage de la fenêtre
+_START = time.perf_counter()
 
 import src.EmotionResult as ER
 
 import tkinter as tk
 from src.EmotionStatistics import EmotionStatistics
+from src.sessionStore import SessionStore
+from src.faceTracker import FaceTracker
+from src.resolution import ResolutionController
+from src.instrumentation import METRICS
+from src.analysisPipeline import AnalysisPipeline
+from src.processPipeline import ProcessAnalysisPipeline
+from src.lazyImport import BackgroundLoader, import_timed
 from tkinter import ttk
-from queue import Queue
-from PIL import Image, ImageTk
+from src.display import TkVideoDisplay
 
+import argparse
 import threading
-import cv2
-import time
 
 #from IA.handDetector import HandPoseDetector
-from src.game.game import Game, create_fruit_ninja_game
+
+# Étape du chargement en arrière-plan qui importe matplotlib et le graphique en direct
+CHART_STEP = "Chargement du graphique"
 
 
 class MainWindow:
-    def __init__(self, root):
+    def __init__(self, root, use_processes=False, metrics_overlay=False):
         """
         Initialise les attributs de la classe permettant de generer l'interface utilisateur
         les bouttons permettent de demarrer la camera et de debuter l'analyse des emotions et ensuite du jeu
@@ -32,7 +41,17 @@ class MainWindow:
         self.setup_controls()
 
         self.detector = ER.EmotionDetector()
-        self.camera = ER.VideoCapture(0)
+        # DeepFace, les modèles et le jeu sont chargés dans un thread : la fenêtre s'affiche tout de suite
+        # matplotlib (graphique en direct) en premier : le graphique apparaît au plus tôt
+        steps = [(CHART_STEP, lambda: import_timed('src.liveChart'))]
+        if not use_processes:
+            # avec --processes, seuls les processus d'inférence chargent DeepFace / TensorFlow
+            steps += [("Chargement de DeepFace", ER.DeepFace.load),
+                      ("Chargement des modèles", self.detector.warm_up)]
+        steps.append(("Chargement du jeu", lambda: import_timed('src.game.game')))
+        self.loader = BackgroundLoader(steps).start()
+        self.root.after(100, self.poll_loading)
+        self.camera = ER.VideoCapture(0, threaded=True)
         self.visualizer = ER.EmotionVisualizer()
         self.is_running = False
 
@@ -46,13 +65,39 @@ class MainWindow:
         self.btn_quit.pack(side="bottom", pady=20, padx=20, fill='x')
 
         self.frame_count = 0
-        self.last_results = []
 
-        self.frame_queue = Queue(maxsize=1)
-        self.analysis_thread = None
-        self.is_analyzing = False
+        self.pipeline = None
+        self._stopping = None  # thread d'arrêt du pipeline précédent
+        self.analysis_workers = 2
+        # Inférence dans des processus séparés (libère le GIL pour l'interface)
+        self.use_processes = use_processes
+        # Affiche les temps par étape sur l'image
+        self.metrics_overlay = metrics_overlay
 
         self.stats = EmotionStatistics()
+        self.session_store = SessionStore()
+        # Graphique en direct, créé dès que matplotlib est chargé (voir poll_loading)
+        self.live_chart = None
+
+    def poll_loading(self):
+        """Affiche la progression du chargement en arrière-plan dans emotion_status"""
+        if self.live_chart is None and CHART_STEP in self.loader.completed:
+            self.create_live_chart()
+        for message in self.loader.poll():
+            if not self.is_running:
+                self.emotion_status.config(text=message, fg="#e67e22")
+        if self.loader.done.is_set():
+            if not self.is_running:
+                self.emotion_status.config(fg="#2ecc71" if not self.loader.errors else "red")
+        else:
+            self.root.after(100, self.poll_loading)
+
+    def create_live_chart(self):
+        """Graphique en direct, au-dessus du bouton Quitter (dans le thread Tk)"""
+        live_chart = import_timed('src.liveChart')
+        self.live_chart = live_chart.LiveEmotionChart(self.control_panel, self.stats, refresh_hz=2)
+        self.live_chart.widget.pack(side="bottom", fill='x', padx=10)
+        self.live_chart.start()
 
     def create_header(self):
         self.header = tk.Frame(self.root, bg="#6C6091", height=60)
@@ -69,6 +114,7 @@ class MainWindow:
         self.video_frame.pack(side="left", fill='both', expand=True)
         self.video_label = tk.Label(self.video_frame, text="Flux Vidéo", fg="white", bg="black")
         self.video_label.pack(expand=True)
+        self.display = TkVideoDisplay(self.video_label, container=self.video_frame)
 
     def setup_controls(self):
         self.control_panel = tk.Frame(self.main_container, bg="#6C6091", width=400)
@@ -89,24 +135,43 @@ class MainWindow:
         print("Signal : Démarrage de la caméra...")
         if self.camera.start():
             self.is_running = True
-
-            self.is_analyzing = True
-            self.analysis_thread = threading.Thread(target=self.background_analysis, daemon=True)
-            self.analysis_thread.start()
+            self.display.reset()
+            # arrêt précédent encore en cours : sa session doit être fermée avant d'en ouvrir une autre
+            self.wait_pipeline_stopped()
+            self.session_store.start_session()
+
+            if self.use_processes:
+                self.pipeline = ProcessAnalysisPipeline(
+                    workers=self.analysis_workers,
+                    detector_kwargs={'detector_backend': self.detector.detector_backend,
+                                     'actions': self.detector.actions},
+                    on_result=self.on_analysis_result)
+            else:
+                # Un seul suivi de visages, qui voit les images dans l'ordre ;
+                # seule la classification est répartie entre les workers
+                tracker = FaceTracker(self.detector, detect_interval=5, resolution=ResolutionController())
+                self.pipeline = AnalysisPipeline(lambda: tracker.classify, workers=self.analysis_workers,
+                                                 on_result=self.on_analysis_result, locate=tracker.locate)
+            self.pipeline.start()
 
             self.create_button_afer_start()
             self.update_loop()
 
     def stop_cam_placeholder(self):
-        self.stats.generer_graphique_emotions()
         self.video_label.config(image="", text="Flux video...")
         self.root.update_idletasks()
         print("Signal : Arrêt de la caméra...")
         self.emotion_status.config(text="Arrêté", fg="red")
 
         self.is_running = False
-        self.is_analyzing = False  # Arrêter le thread d'analyse
+        # workers et session sont arrêtés hors du thread Tk : l'interface ne gèle pas
+        self.stop_pipeline()
         self.camera.release()
+        if self.live_chart is not None:
+            self.live_chart.export()
+        else:
+            # graphique pas encore chargé : export direct des statistiques
+            self.stats.generer_graphique_emotions()
 
         self.video_label.config(image="")
         self.hide_button_afer_stop()
@@ -122,11 +187,17 @@ class MainWindow:
             self.btn_game.pack_forget()
         self.btn_end_game.pack(pady=10, padx=20, fill='x')
         game_thread = threading.Thread(
-            target=create_fruit_ninja_game,
+            target=self.run_game,
             daemon=True
         )
         game_thread.start()
 
+    @staticmethod
+    def run_game():
+        # pygame et le détecteur de mains ne sont importés qu'au lancement du jeu
+        game = import_timed('src.game.game')
+        game.create_fruit_ninja_game()
+
     def end_game_placeholder(self):
         print("Signal : Arrêt du jeu")
         if self.btn_end_game:
@@ -150,54 +221,99 @@ class MainWindow:
             self.btn_end_game.pack_forget()
         self.btn_start.pack(pady=10, padx=20, fill='x', after=self.emotion_status)
 
-    def background_analysis(self):
-        """Boucle tournant dans un thread séparé"""
-        while self.is_analyzing:
-            if not self.frame_queue.empty():
-                frame_to_analyze = self.frame_queue.get()
-                results = self.detector.analyze(frame_to_analyze)
-                for r in results:
-                    for key in ['x', 'y', 'w', 'h']:
-                        r.region[key] *= 2
-
-                self.last_results = results
-                self.stats.extraire_stats_essentielles(results)
-            else:
-                time.sleep(0.01)  # Petite pause pour éviter de saturer le CPU
+    def on_analysis_result(self, output):
+        """Appelé par le pipeline, dans l'ordre des images, pour chaque nouveau résultat"""
+        self.stats.extraire_stats_essentielles(output.results)
+        self.session_store.record(output)
+
+    def stop_pipeline(self, wait: bool = False):
+        """
+        Arrête le pipeline puis ferme la session (tous les résultats en cours sont enregistrés)
+
+        Args:
+            wait: Si False, l'attente des workers se fait dans un thread séparé
+        """
+        pipeline, self.pipeline = self.pipeline, None
+
+        def shutdown():
+            if pipeline is not None:
+                pipeline.stop()
+            self.session_store.close_session()
+
+        if wait:
+            shutdown()
+        else:
+            self._stopping = threading.Thread(target=shutdown, name="pipeline-stop", daemon=True)
+            self._stopping.start()
+
+    def wait_pipeline_stopped(self):
+        if self._stopping is not None:
+            self._stopping.join()
+            self._stopping = None
 
     def update_loop(self):
         if self.is_running:
-            ret, frame = self.camera.read()
-            if ret:
-                if self.frame_queue.empty():
-                    small_frame = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
-                    self.frame_queue.put(small_frame)
-                self.visualizer.draw_results(frame, self.last_results)
-
-                if self.last_results:
-                    top_emotion = self.last_results[0].dominant_emotion
-                    self.emotion_status.config(text=f"Émotion : {top_emotion}", fg="#2ecc71")
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                img = Image.fromarray(rgb_frame)
-                imgtk = ImageTk.PhotoImage(image=img)
-                self.video_label.imgtk = imgtk
-                self.video_label.configure(image=imgtk)
+            # Dernière image capturée, None si la caméra n'en a pas produit de nouvelle
+            latest = self.camera.read_latest()
+            if latest is not None:
+                frame_id, timestamp, frame = latest
+                # Image complète : la réduction pour la détection est gérée par FaceTracker ;
+                # le pipeline la copie dans ses propres tampons (préalloués, ou mémoire partagée
+                # en mode processus), les dessins ci-dessous n'atteignent donc pas l'analyse
+                self.pipeline.submit(frame_id, timestamp, frame)
+
+                output = self.pipeline.latest()
+                results = output.results if output is not None else []
+                with METRICS.timer('draw_results'):
+                    self.visualizer.draw_results(frame, results)
+                if self.metrics_overlay:
+                    METRICS.draw_overlay(frame)
+
+                if results:
+                    top_emotion = results[0].dominant_emotion
+                    self.emotion_status.config(
+                        text=f"Émotion : {top_emotion} ({output.latency * 1000:.0f} ms)", fg="#2ecc71")
+                # Une seule PhotoImage, mise à jour sur place
+                self.display.show(frame, frame_id)
             self.root.after(10, self.update_loop)
 
     def on_closing(self):
         self.is_running = False
+        METRICS.stop_dump()
+        if self.live_chart is not None:
+            self.live_chart.stop()
+        # fenêtre masquée pendant l'attente des workers
+        self.root.withdraw()
+        self.wait_pipeline_stopped()
+        self.stop_pipeline(wait=True)
         self.camera.release()
         self.root.destroy()
 
     def get_latest_frame(self):
         if self.camera:
-            ret, frame = self.camera.read()
-            if ret:
+            # Dernière image capturée, None si la caméra n'en a pas produit de nouvelle
+            latest = self.camera.read_latest()
+            if latest is not None:
+                _, _, frame = latest
                 return frame
         return None
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Detecteur d'emotion")
+    parser.add_argument('--processes', action='store_true',
+                        help="Lance l'analyse dans des processus séparés")
+    parser.add_argument('--metrics-overlay', action='store_true',
+                        help="Affiche les temps de chaque étape sur la vidéo")
+    parser.add_argument('--metrics-dump', metavar='FICHIER',
+                        help="Écrit périodiquement les mesures dans FICHIER")
+    parser.add_argument('--metrics-format', choices=['json', 'prometheus'], default='json')
+    args = parser.parse_args()
+
+    if args.metrics_dump:
+        METRICS.start_dump(args.metrics_dump, interval=10.0, fmt=args.metrics_format)
+
     root = tk.Tk()
-    app = MainWindow(root)
+    app = MainWindow(root, use_processes=args.processes, metrics_overlay=args.metrics_overlay)
+    root.after_idle(lambda: METRICS.observe('startup', time.perf_counter() - _START))
     root.mainloop()
\ No newline at end of file
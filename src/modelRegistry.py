@@ -0,0 +1,96 @@
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from src.faceBatch import MODELES_ACTIONS
+
+
+class ModelRegistry:
+    """Cache partagé par tout le processus des réseaux DeepFace (détecteur + attributs)"""
+
+    def __init__(self):
+        self._models = {}
+        self._warmed = set()
+        self._lock = threading.RLock()
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    def _build(self, task: str, model_name: str):
+        """Construit (une seule fois) un modèle DeepFace et mesure son temps de chargement"""
+        key = (task, model_name)
+        with self._lock:
+            if key not in self._models:
+                from deepface.modules import modeling
+                start = time.perf_counter()
+                self._models[key] = modeling.build_model(task=task, model_name=model_name)
+                self._timing(model_name)['chargement'] = time.perf_counter() - start
+            return self._models[key]
+
+    def _timing(self, model_name: str) -> Dict[str, float]:
+        return self.timings.setdefault(model_name, {})
+
+    def attribute_model(self, action: str):
+        """Retourne le réseau Keras associé à une action ('emotion', 'age', ...)"""
+        return self._build("facial_attribute", MODELES_ACTIONS[action]).model
+
+    def detector(self, detector_backend: str):
+        """Retourne le détecteur de visages DeepFace associé au backend"""
+        return self._build("face_detector", detector_backend)
+
+    def warm_up(self, actions: List[str], detector_backend: str):
+        """
+        Charge puis préchauffe (passe avant factice) tous les réseaux nécessaires
+
+        Args:
+            actions: Liste des analyses ['emotion', 'age', 'gender', 'race']
+            detector_backend: Backend de détection ('opencv', 'ssd', 'mtcnn', etc.)
+        """
+        with self._lock:
+            if detector_backend not in self._warmed:
+                detector = self.detector(detector_backend)
+                start = time.perf_counter()
+                detector.detect_faces(np.zeros((224, 224, 3), dtype=np.uint8))
+                self._timing(detector_backend)['prechauffage'] = time.perf_counter() - start
+                self._warmed.add(detector_backend)
+
+            for action in actions:
+                model_name = MODELES_ACTIONS[action]
+                if model_name in self._warmed:
+                    continue
+                model = self.attribute_model(action)
+                dummy = np.zeros((1,) + tuple(model.input_shape[1:]), dtype=np.float32)
+                start = time.perf_counter()
+                model(dummy, training=False)
+                self._timing(model_name)['prechauffage'] = time.perf_counter() - start
+                self._warmed.add(model_name)
+
+    def warm_up_async(self, actions: List[str], detector_backend: str) -> threading.Thread:
+        """Lance warm_up dans un thread d'arrière-plan et retourne ce thread"""
+        thread = threading.Thread(target=self._warm_up_safe, args=(actions, detector_backend), daemon=True)
+        thread.start()
+        return thread
+
+    def _warm_up_safe(self, actions: List[str], detector_backend: str):
+        try:
+            self.warm_up(actions, detector_backend)
+        except Exception as e:
+            print(f"Erreur lors du préchargement des modèles : {e}")
+
+    def is_ready(self, actions: List[str], detector_backend: str) -> bool:
+        """Indique si tous les réseaux demandés sont chargés et préchauffés"""
+        names = [detector_backend] + [MODELES_ACTIONS[a] for a in actions]
+        return all(name in self._warmed for name in names)
+
+    def report(self) -> str:
+        """Résumé lisible des temps de chargement et de préchauffage"""
+        lines = []
+        for name, timing in self.timings.items():
+            load = timing.get('chargement', 0.0)
+            warm = timing.get('prechauffage', 0.0)
+            lines.append(f"{name}: chargement {load:.2f}s, préchauffage {warm:.2f}s")
+        return "\n".join(lines)
+
+
+# Instance unique partagée par tous les EmotionDetector du processus
+REGISTRY = ModelRegistry()
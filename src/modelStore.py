@@ -0,0 +1,317 @@
+"""
+Magasin de modèles hors ligne.
+
+Exemples :
+    python -m src.modelStore list                  # fichiers connus et état de vérification
+    python -m src.modelStore pin best.pt           # épingle l'empreinte du fichier présent (ex. best.pt réentraîné)
+    python -m src.modelStore fetch --trust palm.onnx   # accepte un fichier sans empreinte connue (téléchargé s'il manque) et l'épingle
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+# Dossier des modèles : même emplacement que celui indiqué dans le README pour best.pt
+DEFAULT_CACHE_DIR = ROOT_DIR / "model"
+
+
+class ModelIntegrityError(RuntimeError):
+    """Le fichier d'un modèle ne correspond pas à l'empreinte attendue"""
+
+
+@dataclass(frozen=True)
+class ModelAsset:
+    """Fichier nécessaire à un modèle (poids, script d'aide...)"""
+    name: str
+    filename: str
+    url: Optional[str] = None
+    sha256: Optional[str] = None
+
+
+def sha256_of(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelStore:
+    """
+    Magasin de modèles hors ligne
+
+    Les fichiers sont cherchés dans le cache local (puis dans les anciens
+    emplacements), sinon copiés depuis un miroir, sinon téléchargés. Chaque
+    fichier est vérifié par SHA-256 avant d'être utilisé (chargé, importé ou
+    désérialisé) : contre l'empreinte épinglée localement avec pin() si elle
+    existe, sinon contre celle de ModelAsset. Un fichier sans empreinte connue
+    n'est jamais accepté implicitement. Les réseaux chargés sont gardés en
+    mémoire pour tout le processus.
+    """
+
+    def __init__(self, cache_dir: Path = None, mirror: str = None, offline: bool = None,
+                 legacy_dirs: Iterable[Path] = ()):
+        """
+        Args:
+            cache_dir: Dossier local des modèles (EMOTION_MODEL_DIR, sinon model/)
+            mirror: Dossier ou URL de base d'un miroir (EMOTION_MODEL_MIRROR)
+            offline: Interdit tout téléchargement (EMOTION_MODEL_OFFLINE=1)
+            legacy_dirs: Anciens dossiers où un fichier peut déjà se trouver
+        """
+        self.cache_dir = Path(cache_dir or os.environ.get('EMOTION_MODEL_DIR', DEFAULT_CACHE_DIR))
+        self.mirror = mirror if mirror is not None else os.environ.get('EMOTION_MODEL_MIRROR')
+        if offline is None:
+            offline = os.environ.get('EMOTION_MODEL_OFFLINE', '0') == '1'
+        self.offline = offline
+        self.legacy_dirs = [Path(d) for d in legacy_dirs]
+
+        self.assets: Dict[str, ModelAsset] = {}  # fichiers déclarés, par nom de fichier
+        self._lock = threading.RLock()
+        self._networks: Dict[object, object] = {}
+        self._manifest_path = self.cache_dir / "manifest.json"
+        self._manifest = None
+
+    def register(self, asset: ModelAsset) -> ModelAsset:
+        """Déclare un fichier (pour la ligne de commande) et le retourne"""
+        self.assets[asset.filename] = asset
+        return asset
+
+    # ---------- manifeste ----------
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        if self._manifest is None:
+            if self._manifest_path.exists():
+                self._manifest = json.loads(self._manifest_path.read_text())
+            else:
+                self._manifest = {}
+        return self._manifest
+
+    def _save_manifest(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._manifest_path.write_text(json.dumps(self._manifest, indent=2))
+
+    def expected_sha256(self, asset: ModelAsset) -> Optional[str]:
+        """Empreinte attendue : celle épinglée localement, sinon celle de ModelAsset"""
+        entry = self._load_manifest().get(asset.filename, {})
+        if entry.get('pinned'):
+            return entry['sha256']
+        return asset.sha256
+
+    def _verify(self, asset: ModelAsset, path: Path):
+        """Vérifie l'empreinte ; un fichier déjà vérifié et inchangé (taille + date) n'est pas rehaché"""
+        expected = self.expected_sha256(asset)
+        if expected is None:
+            raise ModelIntegrityError(
+                f"{path} : aucune empreinte SHA-256 connue. Vérifiez l'origine du fichier puis "
+                f"épinglez-la : python -m src.modelStore pin {asset.filename}")
+
+        manifest = self._load_manifest()
+        entry = manifest.get(asset.filename, {})
+        stat = path.stat()
+        if entry.get('sha256') == expected and entry.get('size') == stat.st_size \
+                and entry.get('mtime') == stat.st_mtime:
+            return
+
+        digest = sha256_of(path)
+        if digest != expected:
+            raise ModelIntegrityError(
+                f"{path} : empreinte {digest} différente de {expected}. Si le fichier a été remplacé "
+                f"volontairement (modèle réentraîné) : python -m src.modelStore pin {asset.filename}")
+
+        manifest[asset.filename] = {'sha256': digest, 'size': stat.st_size, 'mtime': stat.st_mtime,
+                                    'pinned': entry.get('pinned', False)}
+        self._save_manifest()
+
+    def pin(self, asset: ModelAsset, path: Path = None) -> str:
+        """
+        Épingle l'empreinte du fichier actuellement présent
+
+        À utiliser après avoir vérifié soi-même le fichier : nouveau best.pt
+        réentraîné, fichier exporté localement, fichier sans empreinte connue.
+        L'empreinte épinglée remplace celle de ModelAsset sur cette machine.
+
+        Returns:
+            L'empreinte SHA-256 épinglée
+        """
+        with self._lock:
+            path = Path(path) if path is not None else self._local_path(asset)
+            if path is None or not path.exists():
+                raise FileNotFoundError(f"{asset.filename} introuvable dans {self.cache_dir}")
+            stat = path.stat()
+            digest = sha256_of(path)
+            self._load_manifest()[asset.filename] = {'sha256': digest, 'size': stat.st_size,
+                                                     'mtime': stat.st_mtime, 'pinned': True}
+            self._save_manifest()
+            return digest
+
+    def unpin(self, asset: ModelAsset):
+        """Revient à l'empreinte déclarée dans ModelAsset"""
+        with self._lock:
+            if self._load_manifest().pop(asset.filename, None) is not None:
+                self._save_manifest()
+
+    # ---------- résolution des fichiers ----------
+
+    def _local_path(self, asset: ModelAsset) -> Optional[Path]:
+        for folder in [self.cache_dir] + self.legacy_dirs:
+            path = folder / asset.filename
+            if path.exists() and path.stat().st_size > 0:
+                return path
+        return None
+
+    def resolve(self, asset: ModelAsset, trust: bool = False) -> Path:
+        """
+        Retourne le chemin local vérifié d'un fichier de modèle
+
+        Args:
+            trust: Accepte un fichier sans empreinte connue, téléchargé ou déjà
+                présent, dont l'empreinte est alors épinglée (décision explicite de l'utilisateur)
+
+        Raises:
+            FileNotFoundError: fichier introuvable et téléchargement impossible
+            ModelIntegrityError: fichier sans empreinte connue, corrompu ou différent de celui attendu
+        """
+        with self._lock:
+            path = self._local_path(asset)
+            if path is None:
+                path = self.cache_dir / asset.filename
+                self._fetch(asset, path, trust)
+            elif trust and self.expected_sha256(asset) is None:
+                self.pin(asset, path)
+            self._verify(asset, path)
+            return path
+
+    def _fetch(self, asset: ModelAsset, dst: Path, trust: bool):
+        expected = self.expected_sha256(asset)
+        if expected is None and not trust:
+            raise ModelIntegrityError(
+                f"Modèle '{asset.name}' : téléchargement refusé sans empreinte SHA-256 connue. "
+                f"Placez {asset.filename} dans {self.cache_dir} puis lancez "
+                f"'python -m src.modelStore pin {asset.filename}', ou "
+                f"'python -m src.modelStore fetch --trust {asset.filename}'")
+
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_suffix(dst.suffix + ".tmp")
+
+        source = None
+        if self.mirror and not self.mirror.startswith(('http://', 'https://')):
+            if (Path(self.mirror) / asset.filename).exists():
+                source = Path(self.mirror) / asset.filename
+
+        if source is not None:
+            shutil.copyfile(source, tmp)
+        else:
+            url = asset.url
+            if self.mirror and self.mirror.startswith(('http://', 'https://')):
+                url = f"{self.mirror.rstrip('/')}/{asset.filename}"
+            if url is None or self.offline:
+                raise FileNotFoundError(
+                    f"Modèle '{asset.name}' introuvable : placez {asset.filename} dans {self.cache_dir}")
+            print("download:", asset.filename)
+            urllib.request.urlretrieve(url, tmp)
+
+        # vérifié avant d'être mis en place : un fichier refusé n'est jamais utilisé
+        digest = sha256_of(tmp)
+        if expected is not None and digest != expected:
+            tmp.unlink()
+            raise ModelIntegrityError(f"{asset.filename} : empreinte {digest} différente de {expected}")
+        tmp.replace(dst)
+        if expected is None:
+            self.pin(asset, dst)
+
+    # ---------- réseaux chargés ----------
+
+    def network(self, key, loader: Callable[[], object]):
+        """
+        Retourne le réseau associé à key, chargé une seule fois par processus
+
+        Args:
+            key: Identifiant du réseau (ex. ('yolo', chemin))
+            loader: Fonction qui construit le réseau au premier appel
+        """
+        with self._lock:
+            if key not in self._networks:
+                self._networks[key] = loader()
+            return self._networks[key]
+
+
+class LazyModel:
+    """Différé du chargement d'un réseau jusqu'à sa première utilisation"""
+
+    def __init__(self, loader: Callable[[], object]):
+        self._loader = loader
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._loader()
+        return self._model
+
+    def __call__(self, *args, **kwargs):
+        return self.get()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+# Magasin partagé (les anciens emplacements restent utilisables sans rien déplacer)
+STORE = ModelStore(legacy_dirs=[ROOT_DIR / "gesteDetector" / "hand_assets"])
+
+
+def _shared_store() -> ModelStore:
+    # les modules des détecteurs déclarent leurs fichiers à l'import, dans le
+    # magasin de src.modelStore (distinct de celui de __main__ avec python -m)
+    import gesteDetector.gestureRecognizer  # noqa: F401
+    import src.IA.handDetector  # noqa: F401
+    from src import modelStore
+    return modelStore.STORE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Magasin de modèles")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="Fichiers déclarés et empreintes")
+    pin = commands.add_parser('pin', help="Épingle l'empreinte d'un fichier présent localement")
+    pin.add_argument('filename')
+    unpin = commands.add_parser('unpin', help="Revient à l'empreinte déclarée dans le code")
+    unpin.add_argument('filename')
+    fetch = commands.add_parser('fetch', help="Télécharge (si absent) et vérifie un fichier")
+    fetch.add_argument('filename')
+    fetch.add_argument('--trust', action='store_true',
+                       help="Accepte un fichier sans empreinte connue et l'épingle")
+    args = parser.parse_args()
+
+    store = _shared_store()
+    if args.command == 'list':
+        for filename, asset in sorted(store.assets.items()):
+            expected = store.expected_sha256(asset)
+            path = store._local_path(asset)
+            print(f"{filename:24s} {'présent' if path else 'absent ':7s} {expected or 'aucune empreinte'}")
+        return
+
+    asset = store.assets.get(args.filename) or ModelAsset(args.filename, args.filename)
+    if args.command == 'pin':
+        print(f"{args.filename} épinglé : {store.pin(asset)}")
+    elif args.command == 'unpin':
+        store.unpin(asset)
+        print(f"{args.filename} : empreinte déclarée dans le code rétablie")
+    else:
+        print(store.resolve(asset, trust=args.trust))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+import multiprocessing as mp
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+from queue import Empty, Queue
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from src.analysisPipeline import AnalysisOutput, ResultSequencer
+from src.EmotionResult import EmotionResult
+from src.instrumentation import METRICS
+
+# Signal d'arrêt envoyé à chaque processus
+_STOP = None
+
+
+class SharedFrameRing:
+    """Emplacements d'images en mémoire partagée, réutilisés d'une image à l'autre"""
+
+    def __init__(self, slots: int, slot_bytes: int, name: str = None):
+        """
+        Args:
+            slots: Nombre d'emplacements
+            slot_bytes: Taille maximale d'une image en octets
+            name: Nom d'un segment existant à ouvrir (None pour en créer un)
+        """
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            if os.name == 'posix':
+                # Le segment appartient au processus principal : on évite que le
+                # resource_tracker du worker le supprime à sa fermeture
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(self.shm._name, 'shared_memory')
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def view(self, slot: int, shape, dtype=np.uint8) -> np.ndarray:
+        """Tableau numpy pointant directement sur un emplacement (sans copie)"""
+        return np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _compact(results):
+    """EmotionResult -> tuple léger renvoyé au processus principal"""
+    records = []
+    for r in results:
+        region = tuple(int(r.region.get(k, 0)) for k in ('x', 'y', 'w', 'h'))
+        emotions = tuple((label, float(score)) for label, score in r.emotions.items())
+        records.append((r.dominant_emotion, emotions, int(r.age), region))
+    return records
+
+
+def _expand(records):
+    """Tuple léger -> EmotionResult"""
+    return [EmotionResult(dominant_emotion=dominant, emotions=dict(emotions), age=age,
+                          region=dict(zip(('x', 'y', 'w', 'h'), region)))
+            for dominant, emotions, age, region in records]
+
+
+def _tracker_main(ring_name: str, slots: int, slot_bytes: int, owners, track_tasks, tasks,
+                  detector_kwargs: Dict, detect_interval: int):
+    """Point d'entrée du processus de suivi : localise les visages image après image, dans l'ordre"""
+    from src.EmotionResult import EmotionDetector
+    from src.faceTracker import FaceTracker
+    from src.modelRegistry import REGISTRY
+    from src.resolution import ResolutionController
+
+    ring = SharedFrameRing(slots, slot_bytes, name=ring_name)
+    detector = EmotionDetector(**detector_kwargs)
+    # seul le détecteur de visages est utile ici
+    REGISTRY.warm_up([], detector.detector_backend)
+    tracker = FaceTracker(detector, detect_interval=detect_interval, resolution=ResolutionController())
+    try:
+        while True:
+            task = track_tasks.get()
+            if task is _STOP:
+                break
+            slot, frame_id, timestamp, shape = task
+            owners[slot] = os.getpid()
+            # durées des étapes renvoyées avec le résultat : METRICS de ce processus n'est pas affiché
+            with METRICS.collect() as timings:
+                try:
+                    regions = tracker.locate(ring.view(slot, shape))
+                except Exception as e:
+                    print(f"Erreur lors de la localisation des visages : {e}")
+                    regions = []
+            tasks.put((slot, frame_id, timestamp, shape, regions, timings))
+    finally:
+        ring.close()
+
+
+def _worker_main(ring_name: str, slots: int, slot_bytes: int, owners, tasks, results, detector_kwargs: Dict):
+    """Point d'entrée d'un processus de classification"""
+    from src.EmotionResult import EmotionDetector
+
+    ring = SharedFrameRing(slots, slot_bytes, name=ring_name)
+    detector = EmotionDetector(**detector_kwargs)
+    detector.warm_up()
+    try:
+        while True:
+            task = tasks.get()
+            if task is _STOP:
+                break
+            slot, frame_id, timestamp, shape, regions, timings = task
+            owners[slot] = os.getpid()
+            records = []
+            if regions:
+                with METRICS.collect() as classification:
+                    try:
+                        with METRICS.timer('classification'):
+                            records = _compact(detector.classify_regions(ring.view(slot, shape), regions))
+                    except Exception as e:
+                        print(f"Erreur lors de l'analyse : {e}")
+                timings += classification
+            results.put((slot, frame_id, timestamp, records, timings))
+    finally:
+        ring.close()
+
+
+class ProcessAnalysisPipeline:
+    """
+    Variante multi-processus d'AnalysisPipeline : l'inférence TensorFlow tourne
+    hors du processus de l'interface, les images transitent par mémoire partagée
+    et seuls des tuples compacts reviennent.
+
+    Un processus de suivi unique localise les visages dans l'ordre des images
+    (le flux optique a besoin d'images consécutives) ; seule la classification
+    est répartie entre les processus workers.
+    """
+
+    def __init__(self, workers: int = 2, detector_kwargs: Dict = None, detect_interval: int = 5,
+                 on_result: Optional[Callable[[AnalysisOutput], None]] = None, max_restarts: int = 5):
+        """
+        Args:
+            workers: Nombre de processus de classification (plus un processus de suivi)
+            detector_kwargs: Paramètres passés à EmotionDetector dans chaque processus
+            detect_interval: Nombre d'images entre deux détections complètes (FaceTracker)
+            on_result: Rappel appelé pour chaque résultat d'analyse, y compris ceux
+                arrivés trop tard pour l'affichage, dans l'ordre des frame_id
+            max_restarts: Nombre maximal de processus relancés après un arrêt inattendu
+        """
+        self.workers = workers
+        self.detector_kwargs = detector_kwargs or {}
+        self.detect_interval = detect_interval
+        self.on_result = on_result
+        self.max_restarts = max_restarts
+
+        # Un emplacement par worker et pour le suivi, plus un pour toujours avoir une image prête
+        self.slots = workers + 2
+        self._ctx = mp.get_context('spawn')
+        self._ring: Optional[SharedFrameRing] = None
+        self._free_slots = Queue()
+        self._in_flight: Dict[int, int] = {}  # emplacement -> frame_id en cours d'analyse
+        self._owners = None  # pid du dernier processus ayant pris chaque emplacement
+        self._track_tasks = None
+        self._tasks = None
+        self._results = None
+        self._tracker_process = None
+        self._processes = []
+        self._collector = None
+        self._running = False
+        self._stopping = False
+        self._lock = threading.Lock()
+        self._latest: Optional[AnalysisOutput] = None
+        self._sequencer = ResultSequencer(on_result)
+
+        self.dropped_frames = 0
+        self.stale_results = 0
+        self.restarts = 0
+        self.failed = False  # plus aucun processus de suivi ou de classification
+
+    def start(self):
+        """Prépare les files ; les processus démarrent à la première image (taille connue)"""
+        self._latest = None
+        self._sequencer = ResultSequencer(self.on_result)
+        self._track_tasks = self._ctx.Queue()
+        self._tasks = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._running = True
+        self._stopping = False
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    def _start_workers(self, slot_bytes: int):
+        self._ring = SharedFrameRing(self.slots, slot_bytes)
+        self._owners = self._ctx.Array('i', self.slots, lock=False)
+        for slot in range(self.slots):
+            self._free_slots.put(slot)
+        self._tracker_process = self._spawn_tracker()
+        self._processes = [self._spawn_worker() for _ in range(self.workers)]
+
+    def _spawn_tracker(self):
+        process = self._ctx.Process(
+            target=_tracker_main,
+            args=(self._ring.name, self.slots, self._ring.slot_bytes, self._owners, self._track_tasks,
+                  self._tasks, self.detector_kwargs, self.detect_interval),
+            daemon=True)
+        process.start()
+        return process
+
+    def _spawn_worker(self):
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(self._ring.name, self.slots, self._ring.slot_bytes, self._owners, self._tasks,
+                  self._results, self.detector_kwargs),
+            daemon=True)
+        process.start()
+        return process
+
+    def submit(self, frame_id: int, timestamp: float, frame) -> None:
+        """Copie l'image dans un emplacement libre ; l'image est ignorée si tous sont occupés"""
+        if self.failed:
+            self.dropped_frames += 1
+            return
+        if self._ring is None:
+            self._start_workers(frame.nbytes)
+        if frame.nbytes > self._ring.slot_bytes:
+            print("Image trop grande pour la mémoire partagée, ignorée")
+            return
+        try:
+            slot = self._free_slots.get_nowait()
+        except Empty:
+            self.dropped_frames += 1
+            return
+        np.copyto(self._ring.view(slot, frame.shape), frame)
+        # les workers renvoient toujours un résultat (vide en cas d'erreur) ;
+        # si l'un d'eux meurt, _check_workers abandonne ses images
+        with self._lock:
+            self._in_flight[slot] = frame_id
+            self._owners[slot] = 0
+        self._sequencer.expect(frame_id)
+        self._track_tasks.put((slot, frame_id, timestamp, frame.shape))
+
+    def latest(self) -> Optional[AnalysisOutput]:
+        """Dernier résultat publié (ou None)"""
+        return self._latest
+
+    def _release(self, slot: int, frame_id: int) -> bool:
+        """Rend l'emplacement de frame_id ; False s'il a déjà été rendu (image abandonnée)"""
+        with self._lock:
+            if self._in_flight.get(slot) != frame_id:
+                return False
+            del self._in_flight[slot]
+        self._free_slots.put(slot)
+        return True
+
+    def _check_workers(self):
+        """Relance les processus arrêtés et abandonne les images qu'ils analysaient"""
+        if self._stopping or self._ring is None:
+            return
+        roles = [(None, self._tracker_process)] + list(enumerate(self._processes))
+        for index, process in roles:
+            if process is None or process.is_alive():
+                continue
+            print(f"Processus d'analyse {process.pid} arrêté (code {process.exitcode})")
+            with self._lock:
+                lost = [(slot, frame_id) for slot, frame_id in self._in_flight.items()
+                        if self._owners[slot] == process.pid]
+            for slot, frame_id in lost:
+                if self._release(slot, frame_id):
+                    self._sequencer.abandon(frame_id)
+
+            restart = self.restarts < self.max_restarts
+            if restart:
+                self.restarts += 1
+            if index is None:
+                self._tracker_process = self._spawn_tracker() if restart else None
+            else:
+                self._processes[index] = self._spawn_worker() if restart else None
+
+        if self._tracker_process is None or not any(self._processes):
+            # plus aucune image ne peut aboutir : rien ne doit rester attendu
+            if not self.failed:
+                print("Analyse arrêtée : trop de processus d'analyse ont échoué")
+            self.failed = True
+            with self._lock:
+                lost = list(self._in_flight.items())
+            for slot, frame_id in lost:
+                if self._release(slot, frame_id):
+                    self._sequencer.abandon(frame_id)
+
+    def _collect(self):
+        """Thread du processus principal qui reçoit les résultats des workers"""
+        last_check = time.perf_counter()
+        while self._running:
+            if time.perf_counter() - last_check >= 0.5:
+                self._check_workers()
+                last_check = time.perf_counter()
+            try:
+                slot, frame_id, timestamp, records, timings = self._results.get(timeout=0.1)
+            except Empty:
+                continue
+            if not self._release(slot, frame_id):
+                continue
+            output = AnalysisOutput(frame_id, timestamp, time.perf_counter() - timestamp, _expand(records))
+            # Étapes mesurées dans les processus de suivi et de classification, puis latence de bout en bout
+            for name, seconds in timings:
+                METRICS.observe(name, seconds)
+            METRICS.observe('result_latency', output.latency)
+            # Statistiques / enregistrement : tous les résultats, remis dans l'ordre
+            self._sequencer.deliver(output)
+            # Affichage : « le plus récent gagne »
+            with self._lock:
+                if self._latest is not None and frame_id <= self._latest.frame_id:
+                    self.stale_results += 1
+                    continue
+                self._latest = output
+
+    def stop(self, timeout: float = 2.0):
+        """Arrête les processus, le collecteur et libère la mémoire partagée"""
+        self._stopping = True
+        self._processes = [p for p in self._processes if p is not None]
+        # le suivi d'abord : ses dernières images passent avant les signaux d'arrêt des workers
+        if self._tracker_process is not None:
+            self._track_tasks.put(_STOP)
+            self._tracker_process.join(timeout=timeout)
+            if self._tracker_process.is_alive():
+                self._tracker_process.terminate()
+            self._tracker_process = None
+        for _ in self._processes:
+            self._tasks.put(_STOP)
+        for process in self._processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+        self._running = False
+        if self._collector is not None:
+            self._collector.join(timeout=timeout)
+            self._collector = None
+        self._sequencer.close()
+
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+        self._free_slots = Queue()
+        self._in_flight = {}
@@ -0,0 +1,67 @@
+from typing import Dict
+
+import cv2
+
+
+def downscale(frame, scale: float):
+    """Réduit une image d'un facteur scale (renvoyée telle quelle si scale == 1)"""
+    if scale == 1.0:
+        return frame
+    return cv2.resize(frame, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+
+def to_full_resolution(region: Dict[str, int], scale: float) -> Dict[str, int]:
+    """Convertit une région mesurée sur l'image réduite en coordonnées de l'image d'origine"""
+    mapped = dict(region)
+    for key in ('x', 'y', 'w', 'h'):
+        if key in region:
+            mapped[key] = int(round(region[key] / scale))
+    return mapped
+
+
+class ResolutionController:
+    """
+    Ajuste le facteur de réduction de l'image de détection pour tenir un
+    budget de latence : on réduit quand l'analyse est trop lente, on remonte
+    la résolution quand il reste de la marge.
+    """
+
+    def __init__(self, target_latency: float = 0.1, initial_scale: float = 0.5,
+                 min_scale: float = 0.25, max_scale: float = 1.0, step: float = 0.05,
+                 smoothing: float = 0.3):
+        """
+        Args:
+            target_latency: Budget de latence par image analysée (secondes)
+            initial_scale: Facteur de départ
+            min_scale: Facteur minimal (détection de petits visages impossible en dessous)
+            max_scale: Facteur maximal (1.0 = pleine résolution)
+            step: Pas d'ajustement du facteur
+            smoothing: Poids de la nouvelle mesure dans la moyenne glissante
+        """
+        self.target_latency = target_latency
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step
+        self.smoothing = smoothing
+        self.scale = initial_scale
+        self.latency = None
+
+    def update(self, latency: float) -> float:
+        """
+        Prend en compte une nouvelle mesure de latence
+
+        Returns:
+            Le facteur de réduction à utiliser pour la prochaine détection
+        """
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.smoothing * (latency - self.latency)
+
+        # Hystérésis pour éviter d'osciller autour du budget
+        if self.latency > self.target_latency * 1.1:
+            self.scale -= self.step
+        elif self.latency < self.target_latency * 0.7:
+            self.scale += self.step
+        self.scale = round(min(self.max_scale, max(self.min_scale, self.scale)), 3)
+        return self.scale
@@ -0,0 +1,180 @@
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from queue import Empty, Queue
+from typing import Dict, List, Optional
+
+from src.analysisPipeline import AnalysisOutput
+
+EMOTIONS = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral']
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    session_id INTEGER NOT NULL,
+    frame_id INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    face INTEGER NOT NULL,
+    dominant_emotion TEXT,
+    {', '.join(f'{e} REAL' for e in EMOTIONS)},
+    age INTEGER,
+    x INTEGER, y INTEGER, w INTEGER, h INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_results_time ON results (session_id, timestamp);
+"""
+
+_COLUMNS = (['session_id', 'frame_id', 'timestamp', 'face', 'dominant_emotion'] + EMOTIONS
+            + ['age', 'x', 'y', 'w', 'h'])
+_INSERT = f"INSERT INTO results ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+# Signal d'arrêt du thread d'écriture
+_STOP = object()
+
+
+class SessionStore:
+    """
+    Enregistrement persistant (SQLite en mode WAL, ajout seul) de tous les
+    résultats d'une session. Les écritures sont regroupées par lots dans un
+    thread dédié pour ne jamais bloquer l'analyse.
+    """
+
+    def __init__(self, path='datas/sessions.sqlite', batch_size: int = 64, flush_interval: float = 0.5):
+        """
+        Args:
+            path: Fichier de la base SQLite
+            batch_size: Nombre de lignes regroupées par transaction
+            flush_interval: Délai maximal (s) avant l'écriture d'un lot incomplet
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        self.session_id = None
+        self._queue = Queue()
+        self._thread = None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=5.0)
+
+    def start_session(self) -> int:
+        """Crée une nouvelle session et démarre le thread d'écriture"""
+        with closing(self._connect()) as conn, conn:
+            self.session_id = conn.execute("INSERT INTO sessions (started_at) VALUES (?)",
+                                           (time.time(),)).lastrowid
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+        return self.session_id
+
+    def record(self, output: AnalysisOutput):
+        """Ajoute les résultats d'une image (non bloquant) ; ignorés hors session"""
+        if self._thread is None:
+            return
+        # Horodatage de capture converti en heure murale
+        wall_time = time.time() - (time.perf_counter() - output.timestamp)
+        for face, r in enumerate(output.results):
+            region = r.region
+            self._queue.put((self.session_id, output.frame_id, wall_time, face, r.dominant_emotion,
+                             *[float(r.emotions.get(e, 0.0)) for e in EMOTIONS],
+                             int(r.age), region.get('x', 0), region.get('y', 0),
+                             region.get('w', 0), region.get('h', 0)))
+
+    def _writer(self):
+        conn = self._connect()
+        conn.execute("PRAGMA synchronous=NORMAL")
+        rows = []
+        deadline = time.perf_counter() + self.flush_interval
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except Empty:
+                    item = None
+
+                if item is _STOP:
+                    break
+                if item is not None:
+                    rows.append(item)
+
+                if len(rows) >= self.batch_size or (rows and time.perf_counter() >= deadline):
+                    with conn:
+                        conn.executemany(_INSERT, rows)
+                    rows = []
+                if time.perf_counter() >= deadline:
+                    deadline = time.perf_counter() + self.flush_interval
+        finally:
+            if rows:
+                with conn:
+                    conn.executemany(_INSERT, rows)
+            conn.close()
+
+    def close_session(self):
+        """Écrit les derniers résultats et arrête le thread d'écriture"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def query_range(self, start: float = None, end: float = None,
+                    session_id: Optional[int] = None) -> List[Dict]:
+        """
+        Résultats entre deux instants (secondes depuis l'epoch)
+
+        Args:
+            start: Début de l'intervalle (None = pas de borne)
+            end: Fin de l'intervalle (None = pas de borne)
+            session_id: Session à interroger (None = session courante)
+
+        Returns:
+            Liste de dictionnaires, une entrée par visage analysé
+        """
+        where, params = self._where(start, end, session_id)
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f"SELECT * FROM results {where} ORDER BY timestamp, face", params)
+            return [dict(row) for row in rows]
+
+    def emotion_aggregates(self, start: float = None, end: float = None,
+                           session_id: Optional[int] = None) -> Dict:
+        """
+        Agrégats calculés par SQLite sur un intervalle
+
+        Returns:
+            {'count', 'age_moyen', 'moyennes': {émotion: score moyen},
+             'dominantes': {émotion: nombre de fois dominante}}
+        """
+        where, params = self._where(start, end, session_id)
+        moyennes = ', '.join(f'AVG({e})' for e in EMOTIONS)
+        with closing(self._connect()) as conn:
+            row = conn.execute(f"SELECT COUNT(*), AVG(age), {moyennes} FROM results {where}", params).fetchone()
+            dominantes = conn.execute(
+                f"SELECT dominant_emotion, COUNT(*) FROM results {where} GROUP BY dominant_emotion",
+                params).fetchall()
+        return {
+            'count': row[0],
+            'age_moyen': row[1],
+            'moyennes': dict(zip(EMOTIONS, row[2:])),
+            'dominantes': dict(dominantes),
+        }
+
+    def _where(self, start, end, session_id):
+        session_id = session_id if session_id is not None else self.session_id
+        clauses, params = [], []
+        if session_id is not None:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp <= ?")
+            params.append(end)
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
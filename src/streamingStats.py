@@ -0,0 +1,141 @@
+import math
+from collections import deque
+
+import numpy as np
+
+
+class RingBuffer:
+    """Tampon circulaire de taille fixe stocké dans un tableau numpy"""
+
+    def __init__(self, capacity: int, dtype=np.float64):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._start = 0
+        self._size = 0
+
+    def append(self, value):
+        end = (self._start + self._size) % self.capacity
+        self._data[end] = value
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def values(self) -> np.ndarray:
+        """Copie des valeurs conservées, de la plus ancienne à la plus récente"""
+        idx = (self._start + np.arange(self._size)) % self.capacity
+        return self._data[idx]
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+
+class RunningStats:
+    """Moyenne et variance glissantes en O(1) (algorithme de Welford)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class WindowedCounter:
+    """Compte les occurrences de chaque valeur parmi les N dernières"""
+
+    def __init__(self, window: int):
+        self._values = deque(maxlen=window)
+        self.counts = {}
+
+    def add(self, value):
+        if len(self._values) == self._values.maxlen:
+            oldest = self._values[0]
+            self.counts[oldest] -= 1
+            if not self.counts[oldest]:
+                del self.counts[oldest]
+        self._values.append(value)
+        self.counts[value] = self.counts.get(value, 0) + 1
+
+    def __len__(self):
+        return len(self._values)
+
+
+class DownsampledHistory:
+    """
+    Historique à mémoire constante : les points sont regroupés en seaux
+    (min / max / moyenne) et deux seaux voisins fusionnent quand la limite
+    est atteinte, ce qui double la largeur des seaux.
+    """
+
+    def __init__(self, max_buckets: int = 512):
+        if max_buckets % 2:
+            max_buckets += 1
+        self.max_buckets = max_buckets
+        self.bucket_size = 1
+        self.total = 0
+        self._mins = np.zeros(max_buckets)
+        self._maxs = np.zeros(max_buckets)
+        self._sums = np.zeros(max_buckets)
+        self._counts = np.zeros(max_buckets, dtype=np.int64)
+        self._used = 0
+
+    def add(self, value: float):
+        if self._used and self._counts[self._used - 1] < self.bucket_size:
+            i = self._used - 1
+            self._mins[i] = min(self._mins[i], value)
+            self._maxs[i] = max(self._maxs[i], value)
+        else:
+            if self._used == self.max_buckets:
+                self._merge()
+            i = self._used
+            self._mins[i] = self._maxs[i] = value
+            self._sums[i] = 0.0
+            self._counts[i] = 0
+            self._used += 1
+        self._sums[i] += value
+        self._counts[i] += 1
+        self.total += 1
+
+    def _merge(self):
+        """Fusionne les seaux deux à deux (tous pleins à ce stade)"""
+        half = self.max_buckets // 2
+        self._mins[:half] = np.minimum(self._mins[0::2], self._mins[1::2])
+        self._maxs[:half] = np.maximum(self._maxs[0::2], self._maxs[1::2])
+        self._sums[:half] = self._sums[0::2] + self._sums[1::2]
+        self._counts[:half] = self._counts[0::2] + self._counts[1::2]
+        self._used = half
+        self.bucket_size *= 2
+
+    def buckets(self):
+        """
+        Returns:
+            (positions, minimums, maximums, moyennes) ; la position est l'indice
+            du premier point de chaque seau
+        """
+        n = self._used
+        counts = self._counts[:n]
+        positions = np.concatenate(([0], np.cumsum(counts)[:-1])) if n else np.zeros(0)
+        return positions, self._mins[:n].copy(), self._maxs[:n].copy(), self._sums[:n] / counts
+
+    def __len__(self):
+        return self._used
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# les modules s'importent depuis la racine du dépôt (src.X, gesteDetector.X)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,61 @@
+import numpy as np
+
+from src.game.collision import CollisionEngine, overlap_matrix, swept_overlap_matrix
+
+FRUIT = [[400, 300, 460, 360]]
+HAND = np.array([0, 0, 120, 120], dtype=np.float32)
+
+
+def _at(x, y):
+    """Boîte de main de 120 x 120 centrée en (x, y)"""
+    return HAND + [x - 60, y - 60, x - 60, y - 60]
+
+
+def test_fast_crossing_is_detected():
+    # la main saute d'un côté du fruit à l'autre entre deux détections
+    start, end = _at(200, 330), _at(700, 330)
+    assert not overlap_matrix(FRUIT, [start, end]).any()
+    assert swept_overlap_matrix(FRUIT, [start], [end]).tolist() == [[True]]
+
+
+def test_near_miss_is_not_detected():
+    # passe juste au-dessus du fruit : la boîte de la main s'arrête 2 px avant
+    start, end = _at(200, 238), _at(700, 238)
+    assert swept_overlap_matrix(FRUIT, [start], [end]).tolist() == [[False]]
+
+
+def test_diagonal_near_miss_is_not_detected():
+    # le segment passe à côté du coin de la boîte agrandie
+    start, end = _at(420, 526), _at(620, 326)
+    assert not overlap_matrix(FRUIT, [start, end]).any()
+    assert swept_overlap_matrix(FRUIT, [start], [end]).tolist() == [[False]]
+
+
+def test_sweep_stops_at_the_last_detection():
+    # la main s'arrête avant le fruit : pas de prolongation au-delà de end
+    start, end = _at(100, 330), _at(330, 330)
+    assert swept_overlap_matrix(FRUIT, [start], [end]).tolist() == [[False]]
+
+
+def test_still_hand_inside_fruit():
+    box = _at(430, 330)
+    assert swept_overlap_matrix(FRUIT, [box], [box]).tolist() == [[True]]
+
+
+def test_engine_reports_swept_hits():
+    engine = CollisionEngine()
+    fruits = np.array(FRUIT + [[1000, 300, 1060, 360]], dtype=np.float32)
+    start, end = _at(250, 330), _at(580, 330)
+    hits = engine.detect(np.array([3, 7]), fruits, np.array([1, 2]), [end], sweep=([start], [end]))
+    assert [(hit.entity, hit.type_id, hit.hand) for hit in hits] == [(3, 1, 0)]
+    assert hits[0].position == (430.0, 330.0)
+    # sans balayage, la main (déjà passée) ne touche rien
+    assert engine.detect(np.array([3, 7]), fruits, np.array([1, 2]), [end]) == []
+
+
+def test_engine_does_not_sweep_unrelated_hands():
+    # une main disparaît et une autre apparaît loin : pas de trajet entre les deux
+    engine = CollisionEngine()
+    start, end = _at(0, 330), _at(900, 330)
+    assert engine.detect(np.array([0]), np.array(FRUIT, np.float32), np.array([0]), [end],
+                         sweep=([start], [end])) == []
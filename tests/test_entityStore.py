@@ -0,0 +1,73 @@
+import numpy as np
+
+from src.game.entityStore import FREE, WHOLE, EntityStore
+
+
+def test_spawn_fills_columns():
+    store = EntityStore(capacity=4)
+    index = store.spawn(2, (10, 20), (0, 5), (30, 40))
+    assert index == 0
+    assert len(store) == 1
+    assert store.states[index] == WHOLE
+    assert store.type_ids[index] == 2
+    np.testing.assert_array_equal(store.boxes(), [[-5, 0, 25, 40]])
+
+    store.step()
+    np.testing.assert_array_equal(store.positions[index], [10, 25])
+
+
+def test_killed_slot_is_reused():
+    store = EntityStore(capacity=4)
+    indices = [store.spawn(0, (0, 0), (0, 0), (10, 10)) for _ in range(3)]
+    assert indices == [0, 1, 2]
+
+    store.kill(1)
+    assert store.states[1] == FREE
+    np.testing.assert_array_equal(store.live(), [0, 2])
+    # le plus petit emplacement libre est repris en premier
+    assert store.spawn(1, (0, 0), (0, 0), (10, 10)) == 1
+    assert store.spawn(1, (0, 0), (0, 0), (10, 10)) == 3
+
+
+def test_kill_twice_frees_once():
+    store = EntityStore(capacity=2)
+    store.spawn(0, (0, 0), (0, 0), (10, 10))
+    store.kill([0, 0])
+    store.kill(0)
+    assert len(store) == 0
+    assert [store.spawn(0, (0, 0), (0, 0), (1, 1)) for _ in range(2)] == [0, 1]
+    assert store.capacity == 2
+
+
+def test_grows_when_full():
+    store = EntityStore(capacity=2)
+    for i in range(5):
+        store.spawn(i, (i, i), (0, 0), (1, 1))
+    assert store.capacity == 8
+    assert len(store) == 5
+    np.testing.assert_array_equal(store.type_ids[store.live()], [0, 1, 2, 3, 4])
+    np.testing.assert_array_equal(store.positions[4], [4, 4])
+
+
+def test_cull_frees_offscreen_entities():
+    store = EntityStore(capacity=8)
+    inside = store.spawn(0, (100, 100), (0, 5), (20, 20))
+    below = store.spawn(0, (100, 800), (0, 5), (20, 20))
+    left = store.spawn(0, (-50, 100), (0, 5), (20, 20))
+    # au-dessus de l'écran : ne sort que si le fruit remonte
+    falling = store.spawn(0, (100, -50), (0, 5), (20, 20))
+    rising = store.spawn(0, (100, -50), (0, -5), (20, 20))
+
+    gone = store.cull((1280, 720))
+    assert sorted(gone.tolist()) == sorted([below, left, rising])
+    assert sorted(store.live().tolist()) == sorted([inside, falling])
+    assert store.spawn(0, (0, 0), (0, 0), (1, 1)) == below
+
+
+def test_clear():
+    store = EntityStore(capacity=4)
+    for _ in range(3):
+        store.spawn(0, (0, 0), (0, 0), (1, 1))
+    store.clear()
+    assert len(store) == 0
+    assert len(store.with_state(WHOLE)) == 0
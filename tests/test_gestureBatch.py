@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from gesteDetector.gestureRecognizer import FINGER_JOINTS, detect_gesture, detect_gesture_batch
+
+# direction de chaque doigt depuis le poignet (degrés, y vers le bas)
+_DIRECTIONS = {"Thumb": -150.0, "Index": -105.0, "Middle": -90.0, "Ring": -75.0, "Pinky": -60.0}
+
+
+def _hand(rng, extended, scale=40.0, noise=2.0):
+    """21 points d'une main synthétique : doigts tendus (alignés) ou pliés"""
+    kpts = np.zeros((21, 2), np.float32)
+    kpts[0] = rng.uniform(100, 300, 2)
+    for name, joints in FINGER_JOINTS.items():
+        angle = np.radians(_DIRECTIONS[name])
+        direction = np.array([np.cos(angle), np.sin(angle)])
+        point = kpts[0] + direction * scale * 1.5
+        for k, joint in enumerate(joints):
+            kpts[joint] = point
+            if not extended[name]:
+                # doigt replié vers la paume après l'articulation
+                direction = np.array([direction[1], -direction[0]]) if k == 0 else -direction
+            point = point + direction * scale * 0.6
+    return kpts + rng.normal(0.0, noise, kpts.shape).astype(np.float32)
+
+
+def _random_hands(seed, count):
+    rng = np.random.default_rng(seed)
+    hands = []
+    for _ in range(count):
+        extended = {name: bool(rng.random() < 0.5) for name in FINGER_JOINTS}
+        hands.append(_hand(rng, extended))
+    # points quelconques et mains dégénérées (tous les points confondus)
+    hands.extend(rng.uniform(0, 400, (count, 21, 2)).astype(np.float32))
+    hands.append(np.zeros((21, 2), np.float32))
+    return np.stack(hands)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_batch_matches_single(seed):
+    hands = _random_hands(seed, 200)
+    batch = detect_gesture_batch(hands)
+    assert batch.shape == (len(hands),)
+    assert batch.tolist() == [detect_gesture(hand) for hand in hands]
+
+
+def test_random_hands_cover_several_gestures():
+    labels = set(detect_gesture_batch(_random_hands(0, 200)).tolist())
+    assert len(labels) >= 3
+
+
+def test_single_hand_input():
+    hand = _random_hands(3, 1)[0]
+    assert detect_gesture_batch(hand).tolist() == [detect_gesture(hand)]
@@ -0,0 +1,82 @@
+import time
+
+import numpy as np
+
+from src.analysisPipeline import AnalysisOutput, AnalysisPipeline, ResultSequencer
+
+
+def _output(frame_id):
+    return AnalysisOutput(frame_id, 0.0, 0.0, [])
+
+
+def _sequencer():
+    delivered = []
+    return ResultSequencer(lambda output: delivered.append(output.frame_id)), delivered
+
+
+def test_out_of_order_results_are_delivered_in_order():
+    sequencer, delivered = _sequencer()
+    for frame_id in range(4):
+        sequencer.expect(frame_id)
+    sequencer.deliver(_output(2))
+    sequencer.deliver(_output(1))
+    assert delivered == []
+    sequencer.deliver(_output(0))
+    assert delivered == [0, 1, 2]
+    sequencer.deliver(_output(3))
+    assert delivered == [0, 1, 2, 3]
+
+
+def test_abandoned_frame_does_not_block():
+    sequencer, delivered = _sequencer()
+    for frame_id in range(3):
+        sequencer.expect(frame_id)
+    sequencer.deliver(_output(2))
+    sequencer.abandon(1)
+    sequencer.deliver(_output(0))
+    assert delivered == [0, 2]
+
+
+def test_unexpected_and_repeated_results_are_ignored():
+    sequencer, delivered = _sequencer()
+    sequencer.deliver(_output(5))
+    sequencer.expect(6)
+    sequencer.deliver(_output(6))
+    sequencer.deliver(_output(6))
+    sequencer.abandon(6)
+    assert delivered == [6]
+    assert not sequencer._done
+
+
+def test_close_flushes_received_results():
+    sequencer, delivered = _sequencer()
+    for frame_id in range(3):
+        sequencer.expect(frame_id)
+    sequencer.deliver(_output(1))
+    sequencer.close()
+    assert delivered == [1]
+    # un résultat tardif d'une image oubliée n'est plus transmis
+    sequencer.deliver(_output(2))
+    assert delivered == [1]
+    assert not sequencer._done
+
+
+def test_pipeline_delivers_every_result_in_order():
+    delivered = []
+
+    def factory():
+        def analyze(frame):
+            # les workers finissent dans le désordre
+            time.sleep(0.01 if frame[0] % 2 else 0.002)
+            return []
+        return analyze
+
+    pipeline = AnalysisPipeline(factory, workers=3, on_result=lambda output: delivered.append(output.frame_id))
+    pipeline.start()
+    for frame_id in range(60):
+        pipeline.submit(frame_id, time.perf_counter(), np.full(4, frame_id))
+        time.sleep(0.001)
+    time.sleep(0.1)
+    pipeline.stop()
+    assert delivered == sorted(delivered)
+    assert len(delivered) + pipeline.dropped_frames == 60
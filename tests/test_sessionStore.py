@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+from src.EmotionResult import EmotionResult
+from src.analysisPipeline import AnalysisOutput
+from src.sessionStore import SessionStore
+
+
+def _output(frame_id, emotion, age=30):
+    scores = {emotion: 80.0, 'neutral': 20.0} if emotion != 'neutral' else {'neutral': 100.0}
+    result = EmotionResult(emotion, scores, age, {'x': 1, 'y': 2, 'w': 3, 'h': 4})
+    return AnalysisOutput(frame_id, time.perf_counter(), 0.0, [result])
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(tmp_path / 'sessions.sqlite', batch_size=4, flush_interval=0.05)
+    yield store
+    store.close_session()
+
+
+def test_query_range_returns_recorded_rows(store):
+    store.start_session()
+    before = time.time()
+    for frame_id, emotion in enumerate(['happy', 'sad', 'happy']):
+        store.record(_output(frame_id, emotion))
+    store.close_session()
+
+    rows = store.query_range()
+    assert [row['frame_id'] for row in rows] == [0, 1, 2]
+    assert [row['dominant_emotion'] for row in rows] == ['happy', 'sad', 'happy']
+    assert rows[0]['happy'] == 80.0
+    assert (rows[0]['x'], rows[0]['y'], rows[0]['w'], rows[0]['h']) == (1, 2, 3, 4)
+    assert store.query_range(start=before - 60, end=time.time() + 60) == rows
+    assert store.query_range(end=before - 60) == []
+
+
+def test_emotion_aggregates(store):
+    store.start_session()
+    store.record(_output(0, 'happy', age=20))
+    store.record(_output(1, 'happy', age=40))
+    store.record(_output(2, 'neutral', age=30))
+    store.close_session()
+
+    aggregates = store.emotion_aggregates()
+    assert aggregates['count'] == 3
+    assert aggregates['age_moyen'] == pytest.approx(30.0)
+    assert aggregates['moyennes']['happy'] == pytest.approx(160.0 / 3)
+    assert aggregates['moyennes']['neutral'] == pytest.approx(140.0 / 3)
+    assert aggregates['dominantes'] == {'happy': 2, 'neutral': 1}
+
+
+def test_sessions_are_separate(store):
+    first = store.start_session()
+    store.record(_output(0, 'sad'))
+    store.close_session()
+    second = store.start_session()
+    store.record(_output(0, 'happy'))
+    store.close_session()
+
+    assert second != first
+    assert store.emotion_aggregates()['dominantes'] == {'happy': 1}
+    assert store.emotion_aggregates(session_id=first)['dominantes'] == {'sad': 1}
+
+
+def test_results_outside_a_session_are_dropped(store):
+    store.record(_output(0, 'happy'))
+    store.start_session()
+    store.close_session()
+    store.record(_output(1, 'happy'))
+    assert store.query_range() == []
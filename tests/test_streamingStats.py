@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from src.streamingStats import DownsampledHistory, RingBuffer, RunningStats, WindowedCounter
+
+
+def test_running_stats_matches_numpy():
+    values = np.random.default_rng(0).normal(50.0, 12.0, 5000)
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(values.mean(), rel=1e-9)
+    assert stats.variance == pytest.approx(values.var(ddof=1), rel=1e-9)
+    assert stats.std == pytest.approx(values.std(ddof=1), rel=1e-9)
+
+
+def test_running_stats_large_offset():
+    # Welford reste précis là où la somme des carrés perdrait tous les chiffres
+    values = 1e9 + np.random.default_rng(1).random(1000)
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.variance == pytest.approx(values.var(ddof=1), rel=1e-6)
+
+
+def test_running_stats_single_value():
+    stats = RunningStats()
+    stats.add(3.0)
+    assert stats.mean == 3.0
+    assert stats.variance == 0.0
+
+
+def test_ring_buffer_keeps_last_values():
+    ring = RingBuffer(4)
+    assert not ring
+    for value in range(10):
+        ring.append(value)
+        assert len(ring) == min(value + 1, 4)
+    np.testing.assert_array_equal(ring.values(), [6, 7, 8, 9])
+    ring.clear()
+    assert len(ring) == 0
+    assert len(ring.values()) == 0
+
+
+def test_windowed_counter_forgets_old_values():
+    counter = WindowedCounter(3)
+    for value in ['happy', 'sad', 'happy', 'neutral', 'neutral']:
+        counter.add(value)
+    assert len(counter) == 3
+    assert counter.counts == {'happy': 1, 'neutral': 2}
+
+
+def test_downsampled_history_bounds_buckets():
+    history = DownsampledHistory(max_buckets=8)
+    values = np.arange(1000, dtype=float)
+    for value in values:
+        history.add(value)
+
+    assert history.total == len(values)
+    assert len(history) <= history.max_buckets
+    positions, mins, maxs, means = history.buckets()
+    counts = np.diff(np.append(positions, history.total))
+    assert counts.sum() == len(values)
+    for start, count, lo, hi, mean in zip(positions.astype(int), counts, mins, maxs, means):
+        chunk = values[start:start + count]
+        assert lo == chunk.min()
+        assert hi == chunk.max()
+        assert mean == pytest.approx(chunk.mean())
+
+
+def test_downsampled_history_rounds_to_even():
+    assert DownsampledHistory(max_buckets=5).max_buckets == 6